@@ -0,0 +1,11 @@
+"""GUI-free attractor equations and batch tools."""
+from .systems import (
+    DEFAULT_DT,
+    DEFAULT_IC,
+    SYSTEMS,
+    default_params,
+    euler_step,
+    get_system,
+    integrate,
+    resolve_params,
+)
@@ -0,0 +1,374 @@
+"""Accuracy-versus-throughput checks for integrator changes.
+
+Chaos makes point-by-point comparison of long trajectories meaningless, so a
+candidate integrator is judged on two horizons against the baseline
+`integrate`:
+
+    short   maximum error over a short horizon against an RK4 reference in
+            extended precision at dt / `substeps`, starting from points on
+            the attractor. The horizon is SHORT_LYAPUNOV_TIMES Lyapunov
+            times, so on chaotic systems the error has not yet saturated at
+            the attractor size. The candidate may not be much less accurate
+            than the baseline Euler scheme.
+    long    invariant statistics after a transient: bounding box, mean,
+            occupancy histogram (total variation distance) and the leading
+            Lyapunov exponent. Two baseline runs from slightly different
+            initial conditions give the natural spread of each statistic,
+            and a candidate fails when it differs from the baseline by more
+            than max(tolerance, NOISE_FACTOR * spread).
+
+Runs start from HARNESS_IC, which is off the x = y = z line that the
+symmetric systems (Halvorsen, Thomas) leave invariant. Systems whose
+baseline diverges or settles on a fixed point are skipped.
+
+Distances are relative to the diagonal of the baseline bounding box. A
+candidate is any function with the signature of `integrate(func, ic,
+params, steps, dt)` returning rows at times 0, dt, 2 dt, ...; candidates
+that run faster than the baseline but fail a check are flagged.
+
+    python -m attractor_core.accuracy lorenz thomas --candidate scalar float32
+    python -m attractor_core.accuracy --candidate mymodule:fast_integrate
+"""
+import argparse
+import importlib
+import json
+import sys
+import time
+
+import numpy as np
+
+from .systems import DEFAULT_DT, DEFAULT_IC, SYSTEMS, euler_step, get_system, integrate, resolve_params
+
+TOLERANCES = {
+    'short_ratio': 1.25,  # candidate short-horizon error / baseline error
+    'short': 1e-5,        # ...but errors below this are always accepted
+    'bbox': 0.02,
+    'mean': 0.02,
+    'hist': 0.05,
+    'lyapunov': 0.05,     # absolute, per unit time
+}
+HARNESS_IC = (0.1, 0.2, 0.3)
+SHORT_LYAPUNOV_TIMES = 0.5
+MAX_HORIZON = 200
+FIXED_POINT_EXTENT = 1e-6
+NOISE_FACTOR = 2.0
+NOISE_RUNS = 3
+TIMING_REPEAT = 3
+HIST_BINS = 16
+
+
+def _scalar_integrate(func, ic=DEFAULT_IC, params=(), steps=1000, dt=DEFAULT_DT):
+    # The GUI hot loop: euler_step on Python floats, one row at a time
+    out = np.full((steps, 3), np.nan)
+    x, y, z = (float(v) for v in ic)
+    try:
+        for i in range(steps):
+            out[i] = x, y, z
+            x, y, z = euler_step(func, x, y, z, params, dt)
+    except (OverflowError, ZeroDivisionError):
+        pass
+    return out
+
+
+def _float32_integrate(func, ic=DEFAULT_IC, params=(), steps=1000, dt=DEFAULT_DT):
+    # State, parameters and step size all in float32
+    ic = np.asarray(ic, dtype=np.float32)
+    params = tuple(np.float32(p) for p in params)
+    dt = np.float32(dt)
+    out = np.empty((steps,) + ic.shape, dtype=np.float32)
+    x, y, z = ic[..., 0], ic[..., 1], ic[..., 2]
+    with np.errstate(all='ignore'):
+        for i in range(steps):
+            out[i, ..., 0], out[i, ..., 1], out[i, ..., 2] = x, y, z
+            x, y, z = euler_step(func, x, y, z, params, dt)
+    return out
+
+
+def _half_rate_integrate(func, ic=DEFAULT_IC, params=(), steps=1000, dt=DEFAULT_DT):
+    # Half the derivative evaluations: steps of 2 dt, odd rows interpolated
+    coarse = integrate(func, ic, params, (steps + 2) // 2, 2 * dt)
+    out = np.empty((steps,) + coarse.shape[1:])
+    out[0::2] = coarse[:(steps + 1) // 2]
+    out[1::2] = (coarse[:steps // 2] + coarse[1:steps // 2 + 1]) / 2
+    return out
+
+
+CANDIDATES = {
+    'scalar': _scalar_integrate,
+    'float32': _float32_integrate,
+    'half_rate': _half_rate_integrate,
+}
+
+
+def reference_trajectory(func, ic, params, steps, dt=DEFAULT_DT, substeps=16):
+    """Classical RK4 in extended precision, sampled every `dt`."""
+    h = np.longdouble(dt) / substeps
+    state = np.array(ic, dtype=np.longdouble)
+    params = tuple(np.longdouble(p) for p in params)
+
+    def f(s):
+        return np.stack(func(s[..., 0], s[..., 1], s[..., 2], *params), axis=-1)
+
+    out = np.empty((steps,) + state.shape, dtype=np.longdouble)
+    with np.errstate(all='ignore'):
+        for i in range(steps):
+            out[i] = state
+            for _ in range(substeps):
+                k1 = f(state)
+                k2 = f(state + h / 2 * k1)
+                k3 = f(state + h / 2 * k2)
+                k4 = f(state + h * k3)
+                state = state + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+    return out.astype(np.float64)
+
+
+def _hist_edges(points):
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    pad = 0.05 * (hi - lo) + 1e-12
+    return [np.linspace(lo[k] - pad[k], hi[k] + pad[k], HIST_BINS + 1) for k in range(3)]
+
+
+def occupancy(points, edges):
+    """Fraction of points in each histogram cell, plus the fraction outside the grid."""
+    counts, _ = np.histogramdd(points, bins=edges)
+    counts = counts.ravel()
+    inside = counts.sum()
+    return np.append(counts, len(points) - inside) / max(len(points), 1)
+
+
+def lyapunov_exponent(integrator, func, ic, params, steps, dt=DEFAULT_DT, renorm=10, d0=1e-5):
+    """Leading Lyapunov exponent by two-trajectory renormalization (Benettin).
+
+    `d0` is the separation relative to |ic|; every `renorm` steps the
+    neighbour is pulled back to that distance along the current separation.
+    """
+    a = np.asarray(ic, dtype=np.float64)
+    d0 = d0 * max(np.linalg.norm(a), 1.0)
+    b = a + d0 / np.sqrt(3)
+    total = 0.0
+    segments = max(steps // renorm, 1)
+    with np.errstate(all='ignore'):
+        for _ in range(segments):
+            a = np.asarray(integrator(func, a, params, renorm + 1, dt)[-1], dtype=np.float64)
+            b = np.asarray(integrator(func, b, params, renorm + 1, dt)[-1], dtype=np.float64)
+            d = np.linalg.norm(b - a)
+            if not np.isfinite(d) or d == 0:
+                return float('nan')
+            total += np.log(d / d0)
+            b = a + (b - a) * (d0 / d)
+    return float(total / (segments * renorm * dt))
+
+
+def invariants(points, edges):
+    return {
+        'lo': points.min(axis=0),
+        'hi': points.max(axis=0),
+        'mean': points.mean(axis=0),
+        'hist': occupancy(points, edges),
+    }
+
+
+def invariant_distances(a, b, scale):
+    return {
+        'bbox': float(max(np.abs(a['lo'] - b['lo']).max(), np.abs(a['hi'] - b['hi']).max()) / scale),
+        'mean': float(np.abs(a['mean'] - b['mean']).max() / scale),
+        'hist': float(0.5 * np.abs(a['hist'] - b['hist']).sum()),
+    }
+
+
+def _timed(integrator, func, ic, params, steps, dt, repeat=TIMING_REPEAT):
+    # Best of `repeat` runs, so the first call's warm-up does not count
+    best = np.inf
+    with np.errstate(all='ignore'):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            points = np.asarray(integrator(func, ic, params, steps, dt), dtype=np.float64)
+            best = min(best, time.perf_counter() - start)
+    return points, steps / max(best, 1e-9)
+
+
+def _short_error(integrator, func, starts, reference, params, dt, scale):
+    errors = []
+    for start, ref in zip(starts, reference):
+        with np.errstate(all='ignore'):
+            path = np.asarray(integrator(func, start, params, len(ref), dt), dtype=np.float64)
+        error = np.abs(path - ref).max() / scale
+        errors.append(error if np.isfinite(error) else np.inf)
+    return float(np.median(errors))
+
+
+class SystemCheck:
+    """Baseline statistics for one system, computed once and shared by every candidate."""
+
+    def __init__(self, name, params=None, ic=HARNESS_IC, steps=20000, transient=2000,
+                 dt=DEFAULT_DT, horizon=None, windows=5, substeps=16, lyapunov_steps=5000):
+        self.name = name
+        self.func = get_system(name)
+        self.params = resolve_params(name, params)
+        self.ic = tuple(ic)
+        self.steps = steps
+        self.transient = transient
+        self.dt = dt
+        self.lyapunov_steps = lyapunov_steps
+
+        points, self.rate = _timed(integrate, self.func, self.ic, self.params, steps, dt)
+        self.skip = None
+        if not np.isfinite(points).all():
+            self.skip = 'diverges'
+            return
+        points = points[transient:]
+        self.scale = float(np.linalg.norm(points.max(axis=0) - points.min(axis=0)))
+        if self.scale < FIXED_POINT_EXTENT * (1 + float(np.abs(points).max())):
+            # Every candidate would be judged on rounding noise around one point
+            self.skip = 'fixed point'
+            return
+        self.edges = _hist_edges(points)
+        self.base = invariants(points, self.edges)
+        self.lyapunov = lyapunov_exponent(integrate, self.func, points[0], self.params, lyapunov_steps, dt)
+
+        # Natural spread: the same baseline from nudged initial conditions
+        self.noise = dict.fromkeys(('bbox', 'mean', 'hist', 'lyapunov'), 0.0)
+        for run in range(1, NOISE_RUNS + 1):
+            nudged = np.asarray(self.ic) * (1 + run * 1e-9) + run * 1e-9
+            with np.errstate(all='ignore'):
+                other = integrate(self.func, nudged, self.params, steps, dt)[transient:]
+            spread = invariant_distances(self.base, invariants(other, self.edges), self.scale)
+            spread['lyapunov'] = abs(self.lyapunov - lyapunov_exponent(
+                integrate, self.func, other[0], self.params, lyapunov_steps, dt))
+            for key, value in spread.items():
+                self.noise[key] = max(self.noise[key], value if np.isfinite(value) else np.inf)
+
+        if horizon is None:
+            horizon = MAX_HORIZON
+            if self.lyapunov > 0:
+                horizon = int(np.clip(SHORT_LYAPUNOV_TIMES / self.lyapunov / dt, 10, MAX_HORIZON))
+        self.horizon = horizon
+        index = np.linspace(0, len(points) - horizon - 1, windows).astype(int)
+        self.starts = points[index]
+        self.reference = reference_trajectory(self.func, self.starts, self.params, horizon, dt, substeps)
+        self.reference = np.moveaxis(self.reference, 1, 0)
+        self.short = _short_error(integrate, self.func, self.starts, self.reference, self.params, dt, self.scale)
+
+    def limit(self, key):
+        return max(TOLERANCES[key], NOISE_FACTOR * self.noise[key])
+
+    def check(self, integrator):
+        """Measure `integrator` against the baseline; returns a result dict."""
+        result = {'system': self.name}
+        points, rate = _timed(integrator, self.func, self.ic, self.params, self.steps, self.dt)
+        result['steps_per_sec'] = rate
+        result['speedup'] = rate / self.rate
+        if self.skip:
+            result['status'] = 'skipped'
+            result['failures'] = [self.skip]
+            return result
+
+        failures = []
+        finite = np.isfinite(points).all()
+        points = points[self.transient:]
+        short = _short_error(integrator, self.func, self.starts, self.reference, self.params, self.dt, self.scale)
+        result['short_error'] = short
+        result['horizon'] = self.horizon
+        result['baseline_short_error'] = self.short
+        if short > max(self.short * TOLERANCES['short_ratio'], TOLERANCES['short']):
+            failures.append('short')
+
+        if not finite:
+            failures.append('diverges')
+        else:
+            result.update(invariant_distances(self.base, invariants(points, self.edges), self.scale))
+            lyapunov = lyapunov_exponent(integrator, self.func, points[0], self.params, self.lyapunov_steps, self.dt)
+            result['lyapunov'] = lyapunov
+            result['baseline_lyapunov'] = self.lyapunov
+            if not abs(lyapunov - self.lyapunov) <= self.limit('lyapunov'):
+                failures.append('lyapunov')
+            for key in ('bbox', 'mean', 'hist'):
+                if result[key] > self.limit(key):
+                    failures.append(key)
+
+        result['failures'] = failures
+        if not failures:
+            result['status'] = 'ok'
+        elif result['speedup'] > 1:
+            # The case this harness exists for: faster, but wrong
+            result['status'] = 'REJECT'
+        else:
+            result['status'] = 'fail'
+        return result
+
+
+def run_checks(candidates, systems=None, **options):
+    """Check every candidate on every system; returns a list of result dicts."""
+    results = []
+    for name in systems or SYSTEMS:
+        check = SystemCheck(name, **options)
+        for label, integrator in candidates.items():
+            result = check.check(integrator)
+            result['candidate'] = label
+            results.append(result)
+    return results
+
+
+def load_candidate(spec):
+    """A built-in candidate name or 'module:function'."""
+    if spec in CANDIDATES:
+        return CANDIDATES[spec]
+    module, _, attr = spec.partition(':')
+    if not attr:
+        raise ValueError(f"Unknown candidate: {spec}")
+    return getattr(importlib.import_module(module), attr)
+
+
+def _fmt(value, spec='.2e'):
+    return '-' if value is None else format(value, spec)
+
+
+def print_report(results):
+    width = max([14] + [len(r['candidate']) + 2 for r in results])
+    print(f"{'system':<22}{'candidate':<{width}}{'steps/s':>10}{'speedup':>9}{'steps':>6}{'short':>10}{'base':>10}"
+          f"{'bbox':>9}{'mean':>9}{'hist':>9}{'lyap':>8}{'base':>8}  status")
+    for r in results:
+        print(f"{r['system']:<22}{r['candidate']:<{width}}{r['steps_per_sec']:>10.0f}{r['speedup']:>9.2f}{_fmt(r.get('horizon'), 'd'):>6}"
+              f"{_fmt(r.get('short_error')):>10}{_fmt(r.get('baseline_short_error')):>10}"
+              f"{_fmt(r.get('bbox'), '.3g'):>9}{_fmt(r.get('mean'), '.3g'):>9}{_fmt(r.get('hist'), '.3g'):>9}"
+              f"{_fmt(r.get('lyapunov'), '.3g'):>8}{_fmt(r.get('baseline_lyapunov'), '.3g'):>8}"
+              f"  {r['status']} {' '.join(r['failures'])}")
+    for label in dict.fromkeys(r['candidate'] for r in results):
+        rows = [r for r in results if r['candidate'] == label and r['status'] != 'skipped']
+        if not rows:
+            print(f"{label}: no system could be checked")
+            continue
+        rejected = [r['system'] for r in rows if r['status'] == 'REJECT']
+        failed = [r['system'] for r in rows if r['status'] == 'fail']
+        # Geometric mean; systems the baseline cannot integrate are left out
+        speedup = np.exp(np.mean([np.log(r['speedup']) for r in rows]))
+        verdict = 'REJECT' if rejected else 'fail' if failed else 'ok'
+        print(f"{label}: {verdict}, mean speedup {speedup:.2f}x"
+              + (f", accuracy lost on {', '.join(rejected + failed)}" if rejected or failed else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check integrator candidates for speed and accuracy against the baseline.")
+    parser.add_argument('systems', nargs='*', help="systems to check (default: all)")
+    parser.add_argument('--candidate', nargs='+', default=list(CANDIDATES),
+                        help="built-in candidate names or module:function")
+    parser.add_argument('--steps', type=int, default=20000)
+    parser.add_argument('--transient', type=int, default=2000)
+    parser.add_argument('--dt', type=float, default=DEFAULT_DT)
+    parser.add_argument('--horizon', type=int, help="short-horizon steps (default: from the Lyapunov time)")
+    parser.add_argument('--lyapunov-steps', type=int, default=5000)
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args()
+
+    candidates = {spec: load_candidate(spec) for spec in args.candidate}
+    results = run_checks(candidates, args.systems or None, steps=args.steps, transient=args.transient,
+                         dt=args.dt, horizon=args.horizon, lyapunov_steps=args.lyapunov_steps)
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=1)
+    # Non-zero exit so scripts can gate on it
+    sys.exit(1 if any(r['status'] == 'REJECT' for r in results) else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""Basin-of-attraction maps over a 2D slice of initial conditions.
+
+A coarse discovery pass integrates a small grid of initial conditions for a
+long time and records the cells visited at the end of each run; runs that
+share a cell belong to the same attractor. The full grid is then integrated
+in tiles spread over worker processes. Every `check_every` steps each point
+is looked up in the cell map, and a point stops as soon as it has landed on
+the same attractor `confirm` times in a row or has escaped.
+
+Labels: -1 escaped, 0 undetermined after max_steps, 1..K attractors.
+
+    python -m attractor_core.basins halvorsen --resolution 2048 --extent 10 -o halvorsen
+"""
+import argparse
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .systems import DEFAULT_DT, DEFAULT_IC, euler_step, get_system, resolve_params
+
+ESCAPED = -1
+UNDETERMINED = 0
+
+_AXES = {'x': 0, 'y': 1, 'z': 2}
+# Half of the 26-neighbourhood; adjacency is symmetric
+_OFFSETS = np.array([(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)
+                     if (i, j, k) > (0, 0, 0)])
+_PALETTE = np.array([
+    (230, 25, 75), (60, 180, 75), (255, 225, 25), (0, 130, 200), (245, 130, 48),
+    (145, 30, 180), (70, 240, 240), (240, 50, 230), (210, 245, 60), (250, 190, 212),
+], dtype=np.uint8)
+
+
+class CellMap:
+    """Sorted cell keys of a uniform grid, each labelled with an attractor."""
+
+    def __init__(self, origin, cell, shape, keys, labels):
+        self.origin = origin
+        self.cell = cell
+        self.shape = shape
+        self.keys = keys
+        self.labels = labels
+
+    def _cell_keys(self, points):
+        cells = np.floor((points - self.origin) / self.cell).astype(np.int64)
+        inside = ((cells >= 0) & (cells < self.shape)).all(axis=1)
+        keys = cells[:, 0] + self.shape[0] * (cells[:, 1] + self.shape[1] * cells[:, 2])
+        return np.where(inside, keys, -1)
+
+    def lookup(self, points):
+        keys = self._cell_keys(points)
+        if len(self.keys) == 0:
+            return np.zeros(len(points), dtype=np.int16)
+        idx = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return np.where((self.keys[idx] == keys) & (keys >= 0), self.labels[idx], 0).astype(np.int16)
+
+
+def slice_points(center, axes, span, shape):
+    # Initial conditions on a (rows, cols) grid; the first axis varies along
+    # columns, the second along rows, the remaining coordinate is fixed.
+    (lo0, hi0), (lo1, hi1) = span
+    a0, a1 = _AXES[axes[0]], _AXES[axes[1]]
+    rows, cols = shape
+    points = np.empty((rows, cols, 3))
+    points[:] = center
+    points[..., a0] = np.linspace(lo0, hi0, cols)[None, :]
+    points[..., a1] = np.linspace(hi1, lo1, rows)[:, None]
+    return points.reshape(-1, 3)
+
+
+def _run(func, params, points, steps, dt, escape):
+    x, y, z = points[:, 0].copy(), points[:, 1].copy(), points[:, 2].copy()
+    with np.errstate(over='ignore', invalid='ignore'):
+        for _ in range(steps):
+            x, y, z = euler_step(func, x, y, z, params, dt)
+    out = np.column_stack((x, y, z))
+    escaped = ~np.isfinite(out).all(axis=1) | (np.abs(out).max(axis=1) > escape)
+    return out, escaped
+
+
+def discover_attractors(func, params, points, dt=DEFAULT_DT, transient=20000, record=5000,
+                        record_every=10, cells_per_axis=64, escape=1e3):
+    """Find the attractors reached from `points` and return them as a CellMap."""
+    state, escaped = _run(func, params, points, transient, dt, escape)
+    state = state[~escaped]
+    samples = []
+    with np.errstate(over='ignore', invalid='ignore'):
+        x, y, z = state[:, 0], state[:, 1], state[:, 2]
+        for i in range(record):
+            x, y, z = euler_step(func, x, y, z, params, dt)
+            if i % record_every == 0:
+                samples.append(np.column_stack((x, y, z)))
+    if not samples or len(state) == 0:
+        return CellMap(np.zeros(3), 1.0, np.ones(3, dtype=np.int64), np.empty(0, np.int64), np.empty(0, np.int16))
+    samples = np.stack(samples, axis=1)
+    finite = np.isfinite(samples).all(axis=(1, 2)) & (np.abs(samples).max(axis=(1, 2)) <= escape)
+    samples = samples[finite]
+    if len(samples) == 0:
+        return CellMap(np.zeros(3), 1.0, np.ones(3, dtype=np.int64), np.empty(0, np.int64), np.empty(0, np.int16))
+
+    flat = samples.reshape(-1, 3)
+    lo, hi = flat.min(axis=0), flat.max(axis=0)
+    cell = max((hi - lo).max() / cells_per_axis, 1e-9)
+    origin = lo - cell
+    shape = np.floor((hi - origin) / cell).astype(np.int64) + 2
+    cells = CellMap(origin, cell, shape, None, None)
+    keys = cells._cell_keys(flat)
+    owner = np.repeat(np.arange(len(samples)), samples.shape[1])
+
+    # Union runs that visit a common or an adjacent cell; a chaotic run only
+    # covers part of its attractor, so sharing exact cells is too strict.
+    parent = list(range(len(samples)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(a, b):
+        for i, j in zip(a, b):
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[rj] = ri
+
+    order = np.lexsort((owner, keys))
+    keys, owner = keys[order], owner[order]
+    same = np.flatnonzero((keys[1:] == keys[:-1]) & (owner[1:] != owner[:-1]))
+    union(owner[same], owner[same + 1])
+
+    keys, first = np.unique(keys, return_index=True)
+    owner = owner[first]
+    coords = np.column_stack((keys % shape[0], keys // shape[0] % shape[1], keys // (shape[0] * shape[1])))
+    for offset in _OFFSETS:
+        neighbours = coords + offset
+        valid = ((neighbours >= 0) & (neighbours < shape)).all(axis=1)
+        nkeys = neighbours[:, 0] + shape[0] * (neighbours[:, 1] + shape[1] * neighbours[:, 2])
+        idx = np.minimum(np.searchsorted(keys, nkeys), len(keys) - 1)
+        hit = valid & (keys[idx] == nkeys)
+        union(owner[hit], owner[idx[hit]])
+
+    roots = np.array([find(i) for i in range(len(samples))])
+    # Number attractors by size so label 1 is the most common one
+    unique, counts = np.unique(roots, return_counts=True)
+    rank = {root: n + 1 for n, root in enumerate(unique[np.argsort(-counts, kind='stable')])}
+    labels = np.array([rank[r] for r in roots[owner]], dtype=np.int16)
+    return CellMap(origin, cell, shape, keys, labels)
+
+
+def classify(func, params, points, cells, dt=DEFAULT_DT, max_steps=20000, check_every=50, confirm=4, escape=1e3):
+    """Label each initial condition by the attractor it settles on."""
+    n = len(points)
+    labels = np.full(n, UNDETERMINED, dtype=np.int16)
+    active = np.arange(n)
+    x, y, z = points[:, 0].copy(), points[:, 1].copy(), points[:, 2].copy()
+    last = np.zeros(n, dtype=np.int16)
+    seen = np.zeros(n, dtype=np.int16)
+    streak = np.zeros(n, dtype=np.int16)
+    with np.errstate(over='ignore', invalid='ignore'):
+        for step in range(1, max_steps + 1):
+            x, y, z = euler_step(func, x, y, z, params, dt)
+            if step % check_every and step != max_steps:
+                continue
+            state = np.column_stack((x, y, z))
+            escaped = ~np.isfinite(state).all(axis=1) | (np.abs(state).max(axis=1) > escape)
+            state[escaped] = 0
+            current = cells.lookup(state)
+            streak = np.where((current == last) & (current > 0), streak + 1, 1)
+            last = current
+            seen = np.where(current > 0, current, seen)
+            settled = (current > 0) & (streak >= confirm)
+            labels[active[escaped]] = ESCAPED
+            labels[active[settled & ~escaped]] = current[settled & ~escaped]
+            keep = ~(escaped | settled)
+            if step == max_steps:
+                labels[active[keep]] = seen[keep]
+            if not keep.all():
+                active, x, y, z = active[keep], x[keep], y[keep], z[keep]
+                last, seen, streak = last[keep], seen[keep], streak[keep]
+            if len(active) == 0:
+                break
+    return labels
+
+
+_worker = {}
+
+
+def _init_worker(system, params, cells, options):
+    _worker.update(func=get_system(system), params=params, cells=cells, options=options)
+
+
+def _classify_tile(points):
+    return classify(_worker['func'], _worker['params'], points, _worker['cells'], **_worker['options'])
+
+
+def basin_map(system, params=None, center=DEFAULT_IC, axes='xy', span=None, extent=2.0, resolution=512,
+              dt=DEFAULT_DT, max_steps=20000, check_every=50, confirm=4, escape=1e3,
+              discovery_resolution=32, tile_rows=16, workers=None):
+    """Return (labels, cells) for a resolution x resolution slice of initial conditions.
+
+    The slice passes through `center` along `axes` (e.g. 'xy') and covers
+    `span` = ((lo, hi), (lo, hi)), or center +/- extent when span is None.
+    """
+    func = get_system(system)
+    params = resolve_params(system, params)
+    center = np.asarray(center, dtype=np.float64)
+    if span is None:
+        span = tuple((center[_AXES[a]] - extent, center[_AXES[a]] + extent) for a in axes)
+    rows = cols = resolution
+
+    seeds = slice_points(center, axes, span, (discovery_resolution, discovery_resolution))
+    cells = discover_attractors(func, params, seeds, dt, escape=escape)
+
+    options = dict(dt=dt, max_steps=max_steps, check_every=check_every, confirm=confirm, escape=escape)
+    points = slice_points(center, axes, span, (rows, cols))
+    tiles = [points[i * cols:(i + tile_rows) * cols] for i in range(0, rows, tile_rows)]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(system, params, cells, options)) as pool:
+            labels = list(pool.map(_classify_tile, tiles))
+    else:
+        labels = [classify(func, params, tile, cells, **options) for tile in tiles]
+    return np.concatenate(labels).reshape(rows, cols), cells
+
+
+def colorize(labels):
+    rgb = np.zeros(labels.shape + (3,), dtype=np.uint8)
+    rgb[labels == UNDETERMINED] = (128, 128, 128)
+    found = labels > 0
+    rgb[found] = _PALETTE[(labels[found] - 1) % len(_PALETTE)]
+    return rgb
+
+
+def write_png(path, rgb):
+    def chunk(tag, data):
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+    height, width, _ = rgb.shape
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgb.reshape(height, -1)
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b'IEND', b''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute a basin-of-attraction map.")
+    parser.add_argument('system')
+    parser.add_argument('-o', '--output', help="output prefix for .npy and .png (default: <system>_basins)")
+    parser.add_argument('--axes', default='xy', choices=['xy', 'xz', 'yz'])
+    parser.add_argument('--center', type=float, nargs=3, default=DEFAULT_IC)
+    parser.add_argument('--extent', type=float, default=2.0)
+    parser.add_argument('--resolution', type=int, default=512)
+    parser.add_argument('--dt', type=float, default=DEFAULT_DT)
+    parser.add_argument('--max-steps', type=int, default=20000)
+    parser.add_argument('--escape', type=float, default=1e3)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    labels, _ = basin_map(args.system, center=args.center, axes=args.axes, extent=args.extent,
+                          resolution=args.resolution, dt=args.dt, max_steps=args.max_steps,
+                          escape=args.escape, workers=args.workers)
+    prefix = args.output or f"{args.system}_basins"
+    np.save(prefix + '.npy', labels)
+    write_png(prefix + '.png', colorize(labels))
+    values, counts = np.unique(labels, return_counts=True)
+    for value, count in zip(values, counts):
+        name = {ESCAPED: 'escaped', UNDETERMINED: 'undetermined'}.get(value, f'attractor {value}')
+        print(f"{name}: {count / labels.size:.1%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""Periodic checkpoints for long-running integration and animation sessions.
+
+A checkpoint directory holds:
+
+    points-*.f32 accumulated (x, y, z) rows as raw float32, append-only
+    state.json   integrator state, parameters, seeds, the name of the
+                 points file and its number of valid rows; replaced
+                 atomically
+
+Snapshots are written by a background thread. `submit` only stores
+references to the latest state and point buffer, so the caller never waits
+on the disk; the writer appends the rows it has not written yet and then
+publishes the new state. Rows past the count in state.json (from a write
+interrupted by a crash) are ignored on load. A new session gets a new
+points file, and the old one is only removed once state.json points at the
+new one, so a crash at any moment leaves the previous checkpoint readable.
+A Checkpointer picks up the session already on disk, so resuming it keeps
+appending to the same file.
+
+`keep()` copies the latest state to kept.json and protects its points file
+from removal until `release()`, so a session can be set aside (for
+example before the GUI replaces the trajectory after a parameter change)
+and still be loaded with load_checkpoint(directory, KEPT_FILE).
+"""
+import json
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+
+CHECKPOINT_INTERVAL = 30.0
+POINTS_FILE = 'points.f32'  # used by checkpoints that predate per-session files
+STATE_FILE = 'state.json'
+KEPT_FILE = 'kept.json'
+
+
+def new_session_id():
+    return uuid.uuid4().hex
+
+
+def load_checkpoint(directory, state_file=STATE_FILE):
+    """Return (state, points) from the latest checkpoint (or the kept one), or None."""
+    try:
+        with open(os.path.join(directory, state_file)) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    rows = state.get('rows', 0)
+    try:
+        points = np.fromfile(os.path.join(directory, state.get('points', POINTS_FILE)), dtype=np.float32, count=rows * 3)
+    except OSError:
+        return None
+    if len(points) < rows * 3:
+        return None
+    return state, points.reshape(rows, 3)
+
+
+class Checkpointer:
+    def __init__(self, directory, interval=CHECKPOINT_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.last_submit = 0.0
+        self.error = None
+        self._pending = None
+        self._session = None
+        self._points_file = None
+        self._rows = 0
+        self._closed = False
+        checkpoint = load_checkpoint(directory)
+        if checkpoint is not None:
+            # Continue the session on disk instead of rewriting its points
+            state, points = checkpoint
+            self._session = state.get('session')
+            self._points_file = state.get('points', POINTS_FILE)
+            self._rows = len(points)
+        kept = load_checkpoint(directory, KEPT_FILE)
+        self._kept = kept[0].get('points', POINTS_FILE) if kept else None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='checkpoint-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, state, points):
+        """Queue a snapshot; an older snapshot still waiting is replaced.
+
+        `state` must be JSON-serializable and carry a 'session' id; points
+        from earlier snapshots of the same session must be unchanged.
+        """
+        with self._cond:
+            self._pending = (dict(state), points)
+            self.last_submit = time.monotonic()
+            self._cond.notify()
+
+    def maybe_submit(self, state_fn, points_fn):
+        # Cheap to call every frame; the state is only built when due
+        if time.monotonic() - self.last_submit >= self.interval:
+            self.submit(state_fn(), points_fn())
+
+    def flush(self):
+        with self._cond:
+            while self._pending is not None:
+                self._cond.wait()
+
+    def keep(self):
+        """Set the latest published checkpoint aside until `release`.
+
+        Later sessions never delete its points file. Returns False when
+        there is nothing on disk to keep.
+        """
+        self.flush()
+        with self._cond:
+            checkpoint = load_checkpoint(self.directory)
+            if checkpoint is None:
+                return False
+            state = checkpoint[0]
+            previous, self._kept = self._kept, state.get('points', POINTS_FILE)
+            self._write_json(KEPT_FILE, state)
+            if previous and previous not in (self._kept, self._points_file):
+                self._remove(previous)
+            return True
+
+    @property
+    def kept(self):
+        return self._kept is not None
+
+    def release(self):
+        """Drop the kept checkpoint and its points, unless they are still in use."""
+        with self._cond:
+            kept, self._kept = self._kept, None
+            self._remove(KEPT_FILE)
+            if kept and kept != self._points_file:
+                self._remove(kept)
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                state, points = self._pending
+            try:
+                self._write(state, points)
+            except Exception as e:
+                self.error = e
+                print(f"Error writing checkpoint: {e}")
+            finally:
+                with self._cond:
+                    if self._pending is not None and self._pending[0] is state:
+                        self._pending = None
+                    self._cond.notify_all()
+
+    def _write(self, state, points):
+        os.makedirs(self.directory, exist_ok=True)
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        points_file, rows = self._points_file, self._rows
+        new_file = (state.get('session') != self._session or len(points) < rows
+                    or not os.path.exists(os.path.join(self.directory, points_file or '')))
+        if new_file:
+            # New session: a fresh file, so the published checkpoint stays intact
+            points_file, rows = f'points-{uuid.uuid4().hex}.f32', 0
+        try:
+            with open(os.path.join(self.directory, points_file), 'wb' if new_file else 'r+b') as f:
+                f.seek(rows * 12)
+                f.write(np.ascontiguousarray(points[rows:]).tobytes())
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+
+            state['rows'] = len(points)
+            state['points'] = points_file
+            state['saved_at'] = time.time()
+            self._write_json(STATE_FILE, state)
+        except BaseException:
+            if new_file:
+                self._remove(points_file)
+            raise
+        with self._cond:
+            if new_file and self._points_file and self._points_file != self._kept:
+                self._remove(self._points_file)
+            self._session, self._points_file, self._rows = state.get('session'), points_file, len(points)
+
+    def _write_json(self, name, state):
+        tmp = os.path.join(self.directory, name + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.directory, name))
+
+    def _remove(self, name):
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
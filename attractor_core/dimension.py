@@ -0,0 +1,132 @@
+"""Correlation (Grassberger-Procaccia) and box-counting dimension estimates.
+
+Neighbour counting uses a uniform grid hash with cell size equal to the
+largest radius, so each reference point only looks at the 27 surrounding
+cells. Work is split into chunks whose candidate-pair count never exceeds
+`max_pairs`, which bounds memory independently of the trajectory length.
+
+    python -m attractor_core.dimension lorenz --steps 1000000
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .spatial import MAX_PAIRS, GridIndex, as_points, diameter
+from .systems import DEFAULT_DT, DEFAULT_IC, get_system, integrate, resolve_params
+
+REF_CHUNK = 4096
+
+
+def default_radii(points, count=12):
+    size = diameter(points)
+    return np.geomspace(size * 2e-3, size * 5e-2, count)
+
+
+def fit_slope(x, y, fit_range=None):
+    mask = np.isfinite(x) & np.isfinite(y)
+    if fit_range is not None:
+        mask &= (x >= np.log(fit_range[0])) & (x <= np.log(fit_range[1]))
+    if mask.sum() < 2:
+        raise ValueError("not enough valid points to fit a slope")
+    return np.polyfit(x[mask], y[mask], 1)[0]
+
+
+def _count_chunk(grid, refs, r2, theiler, max_pairs):
+    hist = np.zeros(len(r2) + 1, dtype=np.int64)
+    ref_index = grid.order[refs]
+    for who, pos, d2 in grid.candidates(refs, max_pairs):
+        # Theiler window: drop the point itself and its temporal neighbours
+        far = np.abs(grid.order[pos] - ref_index[who]) > theiler
+        hist += np.bincount(np.searchsorted(r2, d2[far], side='right'), minlength=len(r2) + 1)
+    return hist
+
+
+def correlation_sum(trajectory, radii=None, n_refs=5000, max_points=2_000_000, theiler=0,
+                    max_pairs=MAX_PAIRS, workers=1, seed=0):
+    """Correlation sum C(r) estimated from `n_refs` random reference points.
+
+    Reference points are compared against at most `max_points` points drawn
+    uniformly from the trajectory (time order is kept, so the Theiler window
+    is in units of the retained samples). The cost is roughly n_refs times
+    the number of candidates in the 27 cells around each reference.
+    """
+    points = as_points(trajectory)
+    radii = np.sort(np.asarray(radii if radii is not None else default_radii(points), dtype=np.float64))
+    rng = np.random.default_rng(seed)
+    if len(points) > max_points:
+        points = points[np.sort(rng.choice(len(points), size=max_points, replace=False))]
+    grid = GridIndex(points, radii[-1])
+    n = len(points)
+    refs = np.sort(rng.choice(n, size=min(n_refs, n), replace=False))
+    r2 = radii**2
+
+    chunks = [refs[i:i + REF_CHUNK] for i in range(0, len(refs), REF_CHUNK)]
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            hists = list(pool.map(lambda c: _count_chunk(grid, c, r2, theiler, max_pairs), chunks))
+    else:
+        hists = [_count_chunk(grid, c, r2, theiler, max_pairs) for c in chunks]
+    pairs = np.cumsum(np.sum(hists, axis=0))[:-1]
+    candidates = len(refs) * max(n - 1 - 2 * theiler, 1)
+    return radii, pairs / candidates
+
+
+def correlation_dimension(trajectory, radii=None, fit_range=None, **kwargs):
+    """Return (dimension, radii, C) using the slope of log C(r) against log r."""
+    radii, c = correlation_sum(trajectory, radii, **kwargs)
+    with np.errstate(divide='ignore'):
+        return fit_slope(np.log(radii), np.log(c), fit_range), radii, c
+
+
+def box_counts(trajectory, sizes=None, chunk=1 << 22):
+    points = as_points(trajectory)
+    if sizes is None:
+        sizes = default_radii(points)
+    sizes = np.asarray(sizes, dtype=np.float64)
+    origin = points.min(axis=0)
+    counts = []
+    for size in sizes:
+        shape = np.floor((points.max(axis=0) - origin) / size).astype(np.int64) + 1
+        if np.prod(shape.astype(float)) >= 2.0**62:
+            raise ValueError("box size too small for the extent of the trajectory")
+        occupied = np.empty(0, dtype=np.int64)
+        for i in range(0, len(points), chunk):
+            cells = np.floor((points[i:i + chunk] - origin) / size).astype(np.int64)
+            keys = cells[:, 0] + shape[0] * (cells[:, 1] + shape[1] * cells[:, 2])
+            occupied = np.union1d(occupied, keys)
+        counts.append(len(occupied))
+    return sizes, np.array(counts)
+
+
+def box_counting_dimension(trajectory, sizes=None, fit_range=None, chunk=1 << 22):
+    """Return (dimension, sizes, counts) using the slope of log N(eps) against log(1/eps)."""
+    sizes, counts = box_counts(trajectory, sizes, chunk)
+    return -fit_slope(np.log(sizes), np.log(counts), fit_range), sizes, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate fractal dimensions of an attractor.")
+    parser.add_argument('system')
+    parser.add_argument('--steps', type=int, default=200000)
+    parser.add_argument('--dt', type=float, default=DEFAULT_DT)
+    parser.add_argument('--transient', type=int, default=1000)
+    parser.add_argument('--refs', type=int, default=5000)
+    parser.add_argument('--max-points', type=int, default=2_000_000)
+    parser.add_argument('--theiler', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    func = get_system(args.system)
+    points = integrate(func, DEFAULT_IC, resolve_params(args.system), args.steps, args.dt)[args.transient:]
+    d2, radii, c = correlation_dimension(points, n_refs=args.refs, max_points=args.max_points, theiler=args.theiler, workers=args.workers)
+    print(f"Correlation dimension: {d2:.3f}")
+    for r, value in zip(radii, c):
+        print(f"  r={r:.4g}  C={value:.4g}")
+    d0, sizes, counts = box_counting_dimension(points)
+    print(f"Box-counting dimension: {d0:.3f}")
+    for size, count in zip(sizes, counts):
+        print(f"  eps={size:.4g}  N={count}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""Sparse recurrence plots and recurrence quantification analysis (RQA).
+
+The recurrence matrix R[i, j] = |p_i - p_j| < eps is never materialized.
+Rows are processed in blocks; each block queries a grid index for its
+recurrent pairs, measures the vertical and diagonal lines it contains, and
+hands the diagonal lines that cross a block boundary to a sequential
+stitching pass. Blocks are independent, so both the pair search and the
+line measurement run in parallel; only the stitching is sequential.
+
+    python -m attractor_core.recurrence lorenz --steps 100000 --eps 1.0
+"""
+import argparse
+from collections import deque
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .spatial import MAX_PAIRS, GridIndex, as_points, diameter
+from .systems import DEFAULT_DT, DEFAULT_IC, get_system, integrate, resolve_params
+
+BLOCK_ROWS = 4096
+
+
+def _block_pairs(grid, start, stop, eps2, theiler, max_pairs):
+    rows, cols = [], []
+    for who, pos, d2 in grid.candidates(grid.rank[start:stop], max_pairs):
+        i = who + start
+        j = grid.order[pos]
+        keep = (d2 < eps2) & (np.abs(j - i) > theiler)
+        rows.append(i[keep])
+        cols.append(j[keep])
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    order = np.lexsort((cols, rows))
+    return rows[order], cols[order]
+
+
+def recurrence_blocks(trajectory, eps, theiler=0, block_rows=BLOCK_ROWS, max_pairs=MAX_PAIRS):
+    """Yield (row_start, row_stop, rows, cols) for each block of rows.
+
+    rows and cols are the coordinates of recurrent points within the block,
+    sorted by row then column.
+    """
+    points = as_points(trajectory)
+    grid = GridIndex(points, eps)
+    for start in range(0, len(points), block_rows):
+        stop = min(start + block_rows, len(points))
+        rows, cols = _block_pairs(grid, start, stop, eps * eps, theiler, max_pairs)
+        yield start, stop, rows, cols
+
+
+def recurrence_pairs(trajectory, eps, theiler=0, block_rows=BLOCK_ROWS, max_pairs=MAX_PAIRS):
+    """Return the recurrence matrix in coordinate form as (rows, cols)."""
+    blocks = list(recurrence_blocks(trajectory, eps, theiler, block_rows, max_pairs))
+    return np.concatenate([b[2] for b in blocks]), np.concatenate([b[3] for b in blocks])
+
+
+def _runs(keys, steps):
+    # Start/stop offsets of runs where `keys` is constant and `steps` advances
+    # by exactly one; both arrays must already be sorted that way.
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    breaks = (np.diff(keys) != 0) | (np.diff(steps) != 1)
+    starts = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+    stops = np.concatenate((starts[1:], [len(keys)]))
+    return starts, stops
+
+
+def _add_histogram(total, hist):
+    if len(hist) > len(total):
+        total = np.concatenate((total, np.zeros(len(hist) - len(total), dtype=np.int64)))
+    total[:len(hist)] += hist
+    return total
+
+
+def _add_lengths(total, lengths):
+    return _add_histogram(total, np.bincount(lengths)) if len(lengths) else total
+
+
+def _search_and_analyse(grid, eps2, theiler, max_pairs, span):
+    # One parallel task: the pair search and line measurement for rows [start, stop)
+    start, stop = span
+    rows, cols = _block_pairs(grid, start, stop, eps2, theiler, max_pairs)
+    return _analyse_block((start, stop, rows, cols))
+
+
+def _analyse_block(block):
+    start, stop, rows, cols = block
+    # Vertical lines: by symmetry of R, count horizontal runs within each
+    # row, which never cross a block boundary.
+    v_starts, v_stops = _runs(rows, cols)
+    vertical = np.bincount(v_stops - v_starts, minlength=1)
+
+    diag = cols - rows
+    order = np.lexsort((rows, diag))
+    diag, rows = diag[order], rows[order]
+    d_starts, d_stops = _runs(diag, rows)
+    first, last = rows[d_starts], rows[d_stops - 1]
+    lengths = d_stops - d_starts
+    boundary = (first == start) | (last == stop - 1)
+    diagonal = np.bincount(lengths[~boundary], minlength=1)
+    edges = (diag[d_starts][boundary], lengths[boundary], first[boundary] == start, last[boundary] == stop - 1)
+    return len(rows), vertical, diagonal, edges
+
+
+def _stitch(results):
+    # Join diagonal lines that continue across consecutive blocks. `carry`
+    # holds the diagonals whose current line reaches the last row of the
+    # previous block, with the length accumulated so far.
+    recurrences = 0
+    vertical = np.zeros(1, dtype=np.int64)
+    diagonal = np.zeros(1, dtype=np.int64)
+    carry_d = np.empty(0, dtype=np.int64)
+    carry_len = np.empty(0, dtype=np.int64)
+    for count, v_hist, d_hist, (d, length, at_start, at_end) in results:
+        recurrences += count
+        vertical = _add_histogram(vertical, v_hist)
+        diagonal = _add_histogram(diagonal, d_hist)
+
+        heads = np.flatnonzero(at_start)
+        idx = np.searchsorted(carry_d, d[heads])
+        found = idx < len(carry_d)
+        found[found] = carry_d[idx[found]] == d[heads[found]]
+        length = length.copy()
+        length[heads[found]] += carry_len[idx[found]]
+        continued = np.zeros(len(carry_d), dtype=bool)
+        continued[idx[found]] = True
+
+        diagonal = _add_lengths(diagonal, carry_len[~continued])
+        diagonal = _add_lengths(diagonal, length[~at_end])
+        order = np.argsort(d[at_end])
+        carry_d, carry_len = d[at_end][order], length[at_end][order]
+    diagonal = _add_lengths(diagonal, carry_len)
+    return recurrences, vertical, diagonal
+
+
+def _bounded_map(pool, func, items, window):
+    # Like pool.map, but only `window` blocks are held in memory at a time
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _line_measures(hist, minimum):
+    lengths = np.arange(len(hist))
+    points = (lengths * hist).sum()
+    long_points = (lengths * hist)[minimum:].sum()
+    long_lines = hist[minimum:].sum()
+    longest = lengths[hist > 0].max() if hist[1:].any() else 0
+    ratio = long_points / points if points else 0.0
+    mean = long_points / long_lines if long_lines else 0.0
+    return float(ratio), float(mean), int(longest)
+
+
+def rqa(trajectory, eps=None, lmin=2, vmin=2, theiler=0, block_rows=BLOCK_ROWS, max_pairs=MAX_PAIRS, workers=1):
+    """Recurrence quantification measures without building the full matrix.
+
+    Returns a dict with recurrence rate (RR), determinism (DET), mean and
+    longest diagonal line (L, Lmax), laminarity (LAM) and trapping time (TT).
+    Pairs with |i - j| <= theiler, including the main diagonal, are ignored.
+    `eps` defaults to 2% of the attractor diameter.
+    """
+    points = as_points(trajectory)
+    if eps is None:
+        eps = 0.02 * diameter(points)
+    grid = GridIndex(points, eps)
+    spans = ((start, min(start + block_rows, len(points))) for start in range(0, len(points), block_rows))
+    task = partial(_search_and_analyse, grid, eps * eps, theiler, max_pairs)
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            recurrences, vertical, diagonal = _stitch(_bounded_map(pool, task, spans, 2 * workers))
+    else:
+        recurrences, vertical, diagonal = _stitch(map(task, spans))
+
+    n = len(points)
+    w = min(theiler, n - 1)
+    admissible = n * n - n - 2 * (w * n - w * (w + 1) // 2)
+    det, mean_diagonal, longest_diagonal = _line_measures(diagonal, lmin)
+    lam, trapping_time, _ = _line_measures(vertical, vmin)
+    return {
+        'RR': float(recurrences / admissible) if admissible else 0.0,
+        'DET': det,
+        'L': mean_diagonal,
+        'Lmax': longest_diagonal,
+        'LAM': lam,
+        'TT': trapping_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recurrence quantification analysis of an attractor.")
+    parser.add_argument('system')
+    parser.add_argument('--steps', type=int, default=100000)
+    parser.add_argument('--dt', type=float, default=DEFAULT_DT)
+    parser.add_argument('--transient', type=int, default=1000)
+    parser.add_argument('--eps', type=float, help="recurrence threshold (default: 2%% of the attractor diameter)")
+    parser.add_argument('--theiler', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    func = get_system(args.system)
+    points = integrate(func, DEFAULT_IC, resolve_params(args.system), args.steps, args.dt)[args.transient:]
+    for name, value in rqa(points, args.eps, theiler=args.theiler, workers=args.workers).items():
+        print(f"{name}: {value:.4f}" if isinstance(value, float) else f"{name}: {value}")
+
+if __name__ == '__main__':
+    main()
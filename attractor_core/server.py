@@ -0,0 +1,288 @@
+"""Local trajectory server.
+
+Clients send one JSON line per request and receive a JSON header line
+followed by length-prefixed binary chunks of (x, y, z) rows, float64 or
+float32 as requested, terminated by an empty chunk:
+
+    {"system": "lorenz", "params": {"rho": 28}, "ic": [0.1, 0.1, 0.1], "steps": 10000, "dtype": "float32"}
+    {"op": "catalog"}
+
+Identical in-flight requests share one computation, requests for the same
+system, step size and similar length (within a factor of two) arriving
+within a short window are integrated together as one batch, and finished
+trajectories are kept in a shared LRU cache.
+
+Run with `python -m attractor_core.server [--socket PATH | --host H --port P]`.
+"""
+import argparse
+import asyncio
+import json
+import socket
+import struct
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .systems import DEFAULT_DT, DEFAULT_IC, SYSTEMS, default_params, get_system, integrate, resolve_params
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+CHUNK_BYTES = 1 << 20
+BATCH_WINDOW = 0.002
+MAX_BATCH = 256
+# Bound on batch size * steps, i.e. rows of (x, y, z) integrated at once
+MAX_BATCH_ROWS = 1 << 24
+MAX_STEPS = 10_000_000
+CACHE_BYTES = 512 * 1024 * 1024
+# Several executor threads so a long batch does not hold up short ones
+WORKERS = 4
+# Trajectories are integrated and cached in float64; float32 halves the
+# transfer for clients that only render them.
+DTYPES = {'float64': np.float64, 'float32': np.float32}
+
+_LENGTH = struct.Struct('<I')
+
+
+class ResultCache:
+    def __init__(self, max_bytes=CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items = OrderedDict()
+
+    def get(self, key):
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        if value.nbytes > self.max_bytes:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.nbytes -= old.nbytes
+        self._items[key] = value
+        self.nbytes += value.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def __len__(self):
+        return len(self._items)
+
+
+def parse_request(request):
+    system = request.get('system')
+    func = get_system(system)
+    params = tuple(float(p) for p in resolve_params(system, request.get('params')))
+    ic = tuple(float(v) for v in request.get('ic', DEFAULT_IC))
+    if len(ic) != 3:
+        raise ValueError("ic must have three components")
+    steps = int(request.get('steps', 1000))
+    if not 0 < steps <= MAX_STEPS:
+        raise ValueError(f"steps must be between 1 and {MAX_STEPS}")
+    dt = float(request.get('dt', DEFAULT_DT))
+    if request.get('dtype', 'float64') not in DTYPES:
+        raise ValueError(f"dtype must be one of {sorted(DTYPES)}")
+    return func, (system, params, ic, steps, dt)
+
+
+def integrate_batch(func, jobs, dt):
+    # jobs: list of (params, ic, steps); shorter jobs are sliced out of the
+    # longest integration, every job in the batch advances in lockstep.
+    ics = np.array([ic for _, ic, _ in jobs])
+    params = [np.array(column) for column in zip(*(p for p, _, _ in jobs))]
+    steps = max(s for _, _, s in jobs)
+    out = integrate(func, ics, params, steps, dt)
+    return [np.ascontiguousarray(out[:s, j]) for j, (_, _, s) in enumerate(jobs)]
+
+
+class TrajectoryServer:
+    def __init__(self, cache_bytes=CACHE_BYTES, batch_window=BATCH_WINDOW, max_batch=MAX_BATCH,
+                 max_batch_rows=MAX_BATCH_ROWS, workers=WORKERS):
+        self.cache = ResultCache(cache_bytes)
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_batch_rows = max_batch_rows
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.inflight = {}
+        self.pending = {}
+        self.stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'batches': 0, 'integrated': 0}
+
+    async def trajectory(self, func, key):
+        self.stats['requests'] += 1
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            return cached
+        future = self.inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.inflight[key] = future
+        system, params, ic, steps, dt = key
+        # Every job in a batch runs to the batch's longest steps, so only
+        # lengths within a factor of two share one
+        bucket = steps.bit_length()
+        group = (system, dt, bucket)
+        batch = self.pending.get(group)
+        if batch is None:
+            batch = self.pending[group] = (func, [])
+            loop.call_later(self.batch_window, self._flush, group)
+        batch[1].append(key)
+        limit = max(1, min(self.max_batch, self.max_batch_rows >> bucket))
+        if len(batch[1]) >= limit:
+            self._flush(group)
+        return await asyncio.shield(future)
+
+    def _flush(self, group):
+        batch = self.pending.pop(group, None)
+        if batch is None:
+            return
+        func, keys = batch
+        asyncio.get_running_loop().create_task(self._run_batch(func, keys, group[1]))
+
+    async def _run_batch(self, func, keys, dt):
+        jobs = [(params, ic, steps) for _, params, ic, steps, _ in keys]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, integrate_batch, func, jobs, dt)
+        except Exception as e:
+            for key in keys:
+                self.inflight.pop(key).set_exception(e)
+            return
+        self.stats['batches'] += 1
+        self.stats['integrated'] += len(keys)
+        for key, result in zip(keys, results):
+            result.flags.writeable = False
+            self.cache.put(key, result)
+            self.inflight.pop(key).set_result(result)
+
+    def catalog(self):
+        return {name: default_params(name) for name in SYSTEMS}
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if request.get('op') == 'catalog':
+                        await self._send_json(writer, {'catalog': self.catalog()})
+                        continue
+                    if request.get('op') == 'stats':
+                        await self._send_json(writer, {'stats': dict(self.stats, cached=len(self.cache))})
+                        continue
+                    func, key = parse_request(request)
+                    result = await self.trajectory(func, key)
+                    result = result.astype(DTYPES[request.get('dtype', 'float64')], copy=False)
+                except Exception as e:
+                    await self._send_json(writer, {'error': str(e)})
+                    continue
+                await self._send_array(writer, result)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send_json(self, writer, obj):
+        writer.write(json.dumps(obj).encode() + b'\n')
+        await writer.drain()
+
+    async def _send_array(self, writer, array):
+        header = {'dtype': array.dtype.str, 'shape': list(array.shape), 'chunk_bytes': CHUNK_BYTES}
+        writer.write(json.dumps(header).encode() + b'\n')
+        data = memoryview(array).cast('B')
+        for start in range(0, len(data), CHUNK_BYTES):
+            chunk = data[start:start + CHUNK_BYTES]
+            writer.write(_LENGTH.pack(len(chunk)))
+            writer.write(chunk)
+            await writer.drain()
+        writer.write(_LENGTH.pack(0))
+        await writer.drain()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        if path:
+            server = await asyncio.start_unix_server(self.handle_client, path=path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+class TrajectoryClient:
+    """Blocking client, usable from the GUIs and notebooks."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        if path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(path)
+        else:
+            self.sock = socket.create_connection((host, port))
+        self.file = self.sock.makefile('rb')
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _request(self, request):
+        self.sock.sendall(json.dumps(request).encode() + b'\n')
+        header = json.loads(self.file.readline())
+        if 'error' in header:
+            raise ValueError(header['error'])
+        return header
+
+    def catalog(self):
+        return self._request({'op': 'catalog'})['catalog']
+
+    def stats(self):
+        return self._request({'op': 'stats'})['stats']
+
+    def trajectory(self, system, params=None, ic=DEFAULT_IC, steps=1000, dt=DEFAULT_DT, dtype='float64'):
+        header = self._request({'system': system, 'params': params, 'ic': list(ic), 'steps': steps, 'dt': dt,
+                                'dtype': dtype})
+        out = np.empty(header['shape'], dtype=np.dtype(header['dtype']))
+        buffer = memoryview(out).cast('B')
+        offset = 0
+        while True:
+            (length,) = _LENGTH.unpack(self.file.read(_LENGTH.size))
+            if length == 0:
+                break
+            end = offset + length
+            while offset < end:
+                n = self.file.readinto(buffer[offset:end])
+                if not n:
+                    raise ConnectionError("server closed the connection mid-trajectory")
+                offset += n
+        return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve attractor trajectories to local clients.")
+    parser.add_argument('--socket', help="Unix socket path (default: TCP on --host/--port)")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache-mb', type=int, default=CACHE_BYTES // (1024 * 1024))
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    args = parser.parse_args()
+
+    server = TrajectoryServer(cache_bytes=args.cache_mb * 1024 * 1024, workers=args.workers)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
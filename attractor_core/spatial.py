@@ -0,0 +1,87 @@
+"""Uniform-grid neighbour index shared by the dimension and recurrence tools."""
+import numpy as np
+
+MAX_PAIRS = 1 << 22
+
+_OFFSETS = np.array([(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)])
+
+
+def as_points(trajectory):
+    # Accepts an (N, 3) array or the (x, y, z) tuple returned by attractor.py
+    if isinstance(trajectory, tuple):
+        trajectory = np.column_stack(trajectory)
+    points = np.asarray(trajectory, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError(f"expected an (N, 3) trajectory, got shape {points.shape}")
+    points = points[np.isfinite(points).all(axis=1)]
+    if len(points) < 2:
+        raise ValueError("trajectory has fewer than two finite points")
+    return points
+
+
+def diameter(points):
+    return np.linalg.norm(points.max(axis=0) - points.min(axis=0))
+
+
+def _segments(counts, max_pairs):
+    ends = np.cumsum(counts)
+    bounds = [0]
+    while bounds[-1] < len(counts):
+        base = ends[bounds[-1] - 1] if bounds[-1] else 0
+        nxt = np.searchsorted(ends, base + max_pairs, side='right')
+        bounds.append(max(nxt, bounds[-1] + 1))
+    return zip(bounds[:-1], bounds[1:])
+
+
+class GridIndex:
+    """Points bucketed into cubic cells of side `cell`, sorted by cell key.
+
+    Any two points closer than `cell` lie in the same or adjacent cells, so
+    neighbour queries only visit the 27 cells around each reference point.
+    """
+
+    def __init__(self, points, cell):
+        self.cell = cell
+        self.origin = points.min(axis=0)
+        cells = np.floor((points - self.origin) / cell).astype(np.int64)
+        self.shape = cells.max(axis=0) + 1
+        if np.prod(self.shape.astype(float)) >= 2.0**62:
+            raise ValueError("cell size too small for the extent of the trajectory")
+        keys = self._keys(cells)
+        # order maps sorted position -> original index, rank is its inverse
+        self.order = np.argsort(keys, kind='stable')
+        self.rank = np.empty_like(self.order)
+        self.rank[self.order] = np.arange(len(self.order))
+        self.keys = keys[self.order]
+        self.points = points[self.order]
+        self.cells = cells[self.order]
+
+    def _keys(self, cells):
+        return cells[:, 0] + self.shape[0] * (cells[:, 1] + self.shape[1] * cells[:, 2])
+
+    def _neighbour_ranges(self, refs):
+        cells = self.cells[refs][:, None, :] + _OFFSETS[None, :, :]
+        valid = ((cells >= 0) & (cells < self.shape)).all(axis=2)
+        keys = self._keys(cells.reshape(-1, 3)).reshape(valid.shape)
+        start = np.searchsorted(self.keys, keys, side='left')
+        stop = np.searchsorted(self.keys, keys, side='right')
+        counts = np.where(valid, stop - start, 0)
+        owner = np.broadcast_to(np.arange(len(refs))[:, None], valid.shape)
+        keep = counts.ravel() > 0
+        return owner.ravel()[keep], start.ravel()[keep], counts.ravel()[keep]
+
+    def candidates(self, refs, max_pairs=MAX_PAIRS):
+        """Yield (who, pos, d2) for candidate pairs around sorted positions `refs`.
+
+        `who` indexes into `refs`, `pos` is a sorted position and `d2` the
+        squared distance. Each batch holds about `max_pairs` pairs at most.
+        """
+        owner, start, counts = self._neighbour_ranges(refs)
+        ref_points = self.points[refs]
+        for lo, hi in _segments(counts, max_pairs):
+            c = counts[lo:hi]
+            first = np.cumsum(c) - c
+            pos = np.repeat(start[lo:hi] - first, c) + np.arange(c.sum())
+            who = np.repeat(owner[lo:hi], c)
+            d2 = ((self.points[pos] - ref_points[who]) ** 2).sum(axis=1)
+            yield who, pos, d2
@@ -0,0 +1,169 @@
+"""Compact trajectory archives.
+
+Each trajectory is quantized to a grid of step 2 * tolerance, so every
+decoded coordinate is within `tolerance` of the original. The integer
+coordinates are delta-encoded along time, zigzag-mapped to unsigned
+integers of the narrowest width that fits, byte-shuffled and compressed
+with zlib. Chunks of `chunk_rows` rows are encoded independently and
+indexed in a JSON footer, so any row range can be read without decoding
+the rest of the file. tolerance=None stores float64 losslessly.
+
+    with ArchiveWriter('library.atrj') as archive:
+        archive.add('lorenz', points, tolerance=1e-4)
+    points = ArchiveReader('library.atrj').read('lorenz', 1000, 2000)
+"""
+import json
+import struct
+import zlib
+
+import numpy as np
+
+MAGIC = b'ATRJ'
+VERSION = 1
+CHUNK_ROWS = 65536
+LEVEL = 1
+
+_FOOTER = struct.Struct('<Q4s')
+_WIDTHS = (np.uint8, np.uint16, np.uint32, np.uint64)
+
+
+def _shuffle(values):
+    # Group byte 0 of every value, then byte 1, ...: deltas are small, so
+    # the high bytes become long runs of zeros that zlib handles well.
+    return np.ascontiguousarray(values.view(np.uint8).reshape(len(values), -1).T).tobytes()
+
+
+def _unshuffle(data, dtype, count):
+    raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, count)
+    return np.ascontiguousarray(raw.T).view(dtype).ravel()
+
+
+def _encode_chunk(points, step):
+    if step is None:
+        return _shuffle(np.ascontiguousarray(points.T).ravel()), 'f8'
+    q = np.rint(points / step).astype(np.int64)
+    deltas = np.diff(q, axis=0, prepend=np.zeros((1, 3), dtype=np.int64)).T.ravel()
+    zigzag = ((deltas << 1) ^ (deltas >> 63)).view(np.uint64)
+    top = int(zigzag.max()) if len(zigzag) else 0
+    dtype = next(w for w in _WIDTHS if top <= np.iinfo(w).max)
+    return _shuffle(zigzag.astype(dtype)), np.dtype(dtype).str
+
+
+def _decode_chunk(data, dtype, rows, step):
+    values = _unshuffle(data, np.dtype(dtype), rows * 3)
+    if step is None:
+        return values.reshape(3, rows).T.copy()
+    zigzag = values.astype(np.uint64)
+    deltas = (zigzag >> np.uint64(1)).view(np.int64) ^ -(zigzag & np.uint64(1)).view(np.int64)
+    q = np.cumsum(deltas.reshape(3, rows), axis=1)
+    return q.T * step
+
+
+class ArchiveWriter:
+    def __init__(self, path):
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC + struct.pack('<I', VERSION))
+        self.entries = {}
+
+    def add(self, name, trajectory, tolerance=1e-4, chunk_rows=CHUNK_ROWS):
+        if name in self.entries:
+            raise ValueError(f"Duplicate trajectory name: {name}")
+        if isinstance(trajectory, tuple):
+            trajectory = np.column_stack(trajectory)
+        points = np.asarray(trajectory, dtype=np.float64)
+        if points.ndim != 2 or points.shape[1] != 3:
+            raise ValueError(f"expected an (N, 3) trajectory, got shape {points.shape}")
+        step = None
+        if tolerance is not None:
+            if tolerance <= 0:
+                raise ValueError("tolerance must be positive, or None for lossless storage")
+            if not np.isfinite(points).all():
+                raise ValueError("non-finite values cannot be quantized; use tolerance=None")
+            step = 2.0 * tolerance
+            if len(points) and np.abs(points).max() / step >= 2.0**62:
+                raise ValueError("tolerance too small for the range of the trajectory")
+
+        chunks = []
+        for start in range(0, len(points), chunk_rows):
+            block = points[start:start + chunk_rows]
+            data, dtype = _encode_chunk(block, step)
+            data = zlib.compress(data, LEVEL)
+            chunks.append([self.file.tell(), len(data), len(block), dtype])
+            self.file.write(data)
+        self.entries[name] = {'rows': len(points), 'chunk_rows': chunk_rows, 'step': step, 'chunks': chunks}
+
+    def close(self):
+        if self.file.closed:
+            return
+        footer = json.dumps({'entries': self.entries}).encode()
+        self.file.write(footer)
+        self.file.write(_FOOTER.pack(len(footer), MAGIC))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ArchiveReader:
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        head = self.file.read(8)
+        if head[:4] != MAGIC:
+            raise ValueError(f"{path} is not a trajectory archive")
+        self.file.seek(-_FOOTER.size, 2)
+        length, magic = _FOOTER.unpack(self.file.read(_FOOTER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is truncated")
+        self.file.seek(-_FOOTER.size - length, 2)
+        self.entries = json.loads(self.file.read(length))['entries']
+
+    def names(self):
+        return list(self.entries)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def rows(self, name):
+        return self.entries[name]['rows']
+
+    def chunk(self, name, index):
+        entry = self.entries[name]
+        offset, length, rows, dtype = entry['chunks'][index]
+        self.file.seek(offset)
+        return _decode_chunk(zlib.decompress(self.file.read(length)), dtype, rows, entry['step'])
+
+    def read(self, name, start=0, stop=None, dtype=np.float64):
+        """Decode rows [start, stop) of `name`, touching only the chunks they span."""
+        entry = self.entries[name]
+        start, stop, _ = slice(start, stop).indices(entry['rows'])
+        out = np.empty((max(stop - start, 0), 3), dtype=dtype)
+        size = entry['chunk_rows']
+        for index in range(start // size, (stop - 1) // size + 1 if stop > start else 0):
+            lo = index * size
+            block = self.chunk(name, index)
+            a, b = max(start, lo), min(stop, lo + len(block))
+            out[a - start:b - start] = block[a - lo:b - lo]
+        return out
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def save_archive(path, trajectories, tolerance=1e-4, chunk_rows=CHUNK_ROWS):
+    with ArchiveWriter(path) as archive:
+        for name, trajectory in trajectories.items():
+            archive.add(name, trajectory, tolerance, chunk_rows)
+
+
+def load_archive(path, dtype=np.float64):
+    with ArchiveReader(path) as archive:
+        return {name: archive.read(name, dtype=dtype) for name in archive.names()}
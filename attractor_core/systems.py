@@ -0,0 +1,221 @@
+import inspect
+import numpy as np
+
+DEFAULT_IC = (0.1, 0.1, 0.1)
+DEFAULT_DT = 0.01
+
+# Attractor equations. Every function returns the derivative (dx, dy, dz) and
+# works elementwise, so x, y, z and the parameters may be scalars or arrays.
+def lorenz(x, y, z, sigma=10, rho=28, beta=8/3):
+    return sigma * (y - x), x * (rho - z) - y, x * y - beta * z
+
+def rossler(x, y, z, a=0.2, b=0.2, c=5.7):
+    return -y - z, x + a * y, b + z * (x - c)
+
+def aizawa(x, y, z, a=0.95, b=0.7, c=0.6, d=3.5, e=0.25, f=0.1):
+    dx = (z - b) * x - d * y
+    dy = d * x + (z - b) * y
+    dz = c + a * z - z**3 / 3 - (x**2 + y**2) * (1 + e * z) + f * z * x**3
+    return dx, dy, dz
+
+def chen(x, y, z, a=35, b=3, c=28):
+    return a * (y - x), (c - a) * x - x * z + c * y, x * y - b * z
+
+def halvorsen(x, y, z, a=1.4):
+    dx = -a * x - 4 * y - 4 * z - y**2
+    dy = -a * y - 4 * z - 4 * x - z**2
+    dz = -a * z - 4 * x - 4 * y - x**2
+    return dx, dy, dz
+
+def thomas(x, y, z, b=0.208186):
+    return -b * x + np.sin(y), -b * y + np.sin(z), -b * z + np.sin(x)
+
+def sprott(x, y, z, a=2.07):
+    return y + a * x * y + x * z, 1 - a * x**2 + y * z, x - x**2 - y**2
+
+def dadras(x, y, z, a=3, b=2.7, c=1.7, d=2, e=9):
+    return y - a * x + b * y * z, c * y - x * z + z, d * x * y - e * z
+
+def four_wing(x, y, z, a=0.2, b=0.01, c=-0.4):
+    return a * x + y * z, b * x + c * y - x * z, -z - x * y
+
+def burke_shaw(x, y, z, s=10, v=4.272):
+    return -s * (x + y), -y - s * x * z, s * x * y + v
+
+def lorenz83(x, y, z, a=0.95, b=7.91, f=4.83, g=4.66):
+    dx = -a * x - y**2 - z**2 + a * f
+    dy = -y + x * y - b * x * z + g
+    dz = -z + b * x * y + x * z
+    return dx, dy, dz
+
+def moore_spiegel(x, y, z, a=100, b=26, c=0.5):
+    return y, z, -z - (a - c * x**2) * y - c * x
+
+def rucklidge(x, y, z, a=2, k=6.7):
+    return -a * x + k * y - y * z, x, -z + y**2
+
+def dequan_li(x, y, z, a=40, c=1.833, d=0.16, e=0.65, k=55, f=20):
+    return a * (y - x) + d * x * z, k * x + f * y - x * z, c * z + x * y - e * x**2
+
+def yu_wang(x, y, z, a=10, b=40, c=2, d=2.5):
+    return a * (y - x), b * x - c * x * z, np.exp(x * y) - d * z
+
+def nose_hoover(x, y, z, a=1.5):
+    return y, -x + y * z, a - y**2
+
+def rabinovich_fabrikant(x, y, z, alpha=0.14, gamma=0.10):
+    dx = y * (z - 1 + x**2) + gamma * x
+    dy = x * (3 * z + 1 - x**2) + gamma * y
+    dz = -2 * z * (alpha + x * y)
+    return dx, dy, dz
+
+def three_scroll(x, y, z, a=40, b=0.833, c=20, d=0.5, e=0.65):
+    return a * (y - x) + d * x * z, c * y - x * z, b * z + x * y - e * x**2
+
+def tamari(x, y, z, a=1.5, b=0.8, c=2.5):
+    return y - a * x, b * x - y**2 - z**2, x * y - c * z
+
+def scroll(x, y, z, a=40, b=0.833, c=20, d=0.5):
+    return a * (y - x) + d * x * z, c * y - x * z, b * z + x * y - y**2
+
+# Systems that only appear in attractor.py's matplotlib viewer
+def chenlee(x, y, z, a=5, b=-10, c=-0.38):
+    return a * x - y * z, b * y + x * z, c * z + x * y / 3
+
+def lorenz_mod2(x, y, z, alpha=0.9, beta=5, gamma=9.9):
+    return -alpha * x + y * y - z * z + alpha * gamma, x * (y - beta * z), -z + x * y
+
+def hadley(x, y, z, alpha=0.2, beta=4, delta=8):
+    return -alpha * x + y * y - z * z + alpha * delta, x * (y - beta * z), -z + x * y
+
+def lu(x, y, z, a=36, b=3, c=20):
+    return a * (y - x), c * x - x * z + c * y, x * y - b * z
+
+def newton_leipnik(x, y, z, a=0.4, b=0.175):
+    dx = a * x - y - 10 * z - y * y
+    dy = a * y + x - 5 * z - x * x
+    dz = b * z + x * y - x * z
+    return dx, dy, dz
+
+def rikitake(x, y, z, mu=2, nu=0.1):
+    return mu * x - nu * y * z, mu * y - nu * x * z, -z + x * y
+
+def genesio_tesi(x, y, z, a=1.2, b=2.92, c=5):
+    return y, z, -a * x - b * y - c * z + x**2
+
+def bouali(x, y, z, alpha=0.3, beta=0.7):
+    return x * (4 - y) + alpha * z, -y * (1 - x**2), -x * (beta + z)
+
+def coullet(x, y, z, a=0.2, b=0.4, c=-0.1):
+    return x * (1 - x) - a * y * z, y * (1 - y) - b * z * x, z * (1 - z) - c * x * y
+
+def lotka_volterra(x, y, z, alpha=1.5, beta=1, delta=1, gamma=3):
+    return alpha * x - beta * x * y, -gamma * y + delta * x * y, -z + x * y
+
+# attractor.py uses different equations under these three names
+def sprott_classic(x, y, z, a=2.07):
+    return y + a * x - x * z, -x - y * z, 1 - x * y
+
+def dequan_li_classic(x, y, z, a=40, b=1.833, c=0.16, d=0.65):
+    return a * (y - x) + b * x * z, d * y - x * z, c * z + x * y
+
+def burke_shaw_classic(x, y, z, alpha=10):
+    return -alpha * x + y * z, -y + x * (z + alpha), 1 - x * y
+
+
+SYSTEMS = {
+    name: func for name, func in [
+        ("lorenz", lorenz),
+        ("rossler", rossler),
+        ("aizawa", aizawa),
+        ("chen", chen),
+        ("halvorsen", halvorsen),
+        ("thomas", thomas),
+        ("sprott", sprott),
+        ("dadras", dadras),
+        ("four_wing", four_wing),
+        ("burke_shaw", burke_shaw),
+        ("lorenz83", lorenz83),
+        ("moore_spiegel", moore_spiegel),
+        ("rucklidge", rucklidge),
+        ("dequan_li", dequan_li),
+        ("yu_wang", yu_wang),
+        ("nose_hoover", nose_hoover),
+        ("rabinovich_fabrikant", rabinovich_fabrikant),
+        ("three_scroll", three_scroll),
+        ("tamari", tamari),
+        ("scroll", scroll),
+        ("chenlee", chenlee),
+        ("lorenz_mod2", lorenz_mod2),
+        ("hadley", hadley),
+        ("lu", lu),
+        ("newton_leipnik", newton_leipnik),
+        ("rikitake", rikitake),
+        ("genesio_tesi", genesio_tesi),
+        ("bouali", bouali),
+        ("coullet", coullet),
+        ("lotka_volterra", lotka_volterra),
+        ("sprott_classic", sprott_classic),
+        ("dequan_li_classic", dequan_li_classic),
+        ("burke_shaw_classic", burke_shaw_classic),
+    ]
+}
+
+
+def get_system(name):
+    try:
+        return SYSTEMS[name]
+    except KeyError:
+        raise ValueError(f"Unknown system: {name}") from None
+
+def default_params(name):
+    sig = inspect.signature(get_system(name))
+    return {p.name: p.default for p in list(sig.parameters.values())[3:]}
+
+def resolve_params(name, params=None):
+    """Return the full parameter tuple for `name`, in signature order.
+
+    `params` may be None, a sequence of positional values, or a dict of
+    overrides by parameter name.
+    """
+    values = default_params(name)
+    if params is None:
+        return tuple(values.values())
+    if isinstance(params, dict):
+        unknown = set(params) - set(values)
+        if unknown:
+            raise ValueError(f"Unknown parameters for {name}: {sorted(unknown)}")
+        values.update(params)
+        return tuple(values.values())
+    params = tuple(params)
+    if len(params) > len(values):
+        raise ValueError(f"{name} takes {len(values)} parameters, got {len(params)}")
+    return params + tuple(values.values())[len(params):]
+
+
+def euler_step(func, x, y, z, params, dt=DEFAULT_DT):
+    dx, dy, dz = func(x, y, z, *params)
+    return x + dx * dt, y + dy * dt, z + dz * dt
+
+def integrate(func, ic=DEFAULT_IC, params=(), steps=1000, dt=DEFAULT_DT, dtype=np.float64):
+    """Forward-Euler trajectory of `func`, vectorized over a batch.
+
+    `ic` has shape (..., 3); each entry of `params` is a scalar or an array
+    broadcastable to the batch shape. Returns an array of shape
+    (steps, ..., 3) whose first row is the initial condition. The state is
+    always advanced in float64; `dtype` only sets the storage precision,
+    e.g. float32 for trajectories that are only going to be rendered.
+    """
+    ic = np.asarray(ic, dtype=np.float64)
+    out = np.empty((steps,) + ic.shape, dtype=dtype)
+    if steps == 0:
+        return out
+    x, y, z = ic[..., 0], ic[..., 1], ic[..., 2]
+    out[0] = ic
+    with np.errstate(over='ignore', invalid='ignore'):
+        for i in range(1, steps):
+            x, y, z = euler_step(func, x, y, z, params, dt)
+            out[i, ..., 0] = x
+            out[i, ..., 1] = y
+            out[i, ..., 2] = z
+    return out
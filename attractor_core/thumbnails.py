@@ -0,0 +1,156 @@
+"""Low-resolution attractor previews and an on-disk thumbnail atlas.
+
+The atlas directory holds fixed-size RGB slots appended to one raw file
+plus a JSON index mapping keys to slots, so previews survive restarts and
+are only ever computed once per (system, parameters) key. Missing previews
+are rendered by a pool of worker processes; GUIs call `poll()` from a timer
+and fill in icons as results arrive.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+THUMB_SIZE = 48
+ATLAS_DIR = os.path.join(os.path.expanduser("~"), ".attractors", "thumbnails")
+INDEX_FILE = 'index.json'
+SLOTS_FILE = 'slots.u8'
+
+
+def thumbnail_key(*spec):
+    """Stable key for a preview, built from plain values (names, parameters, sizes)."""
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+
+def render_thumbnail(trajectory, size=THUMB_SIZE):
+    """Density image of a trajectory projected on its two widest axes."""
+    if isinstance(trajectory, tuple):
+        trajectory = np.column_stack(trajectory)
+    points = np.asarray(trajectory, dtype=np.float64)
+    points = points[np.isfinite(points).all(axis=1)]
+    image = np.zeros((size, size, 3), dtype=np.uint8)
+    if len(points) < 2:
+        return image
+    points = points[len(points) // 10:]
+    extent = points.max(axis=0) - points.min(axis=0)
+    a, b = np.sort(np.argsort(extent)[-2:])
+    span = max(extent[a], extent[b]) or 1.0
+    center = (points.max(axis=0) + points.min(axis=0)) / 2
+    u = (points[:, a] - center[a]) / span + 0.5
+    v = 0.5 - (points[:, b] - center[b]) / span
+    density, _, _ = np.histogram2d(v, u, bins=size, range=[[0, 1], [0, 1]])
+    density = np.log1p(density)
+    if density.max() > 0:
+        density /= density.max()
+    image[..., 0] = 255 * density**1.5
+    image[..., 1] = 255 * density**0.8
+    image[..., 2] = 255 * np.sqrt(density)
+    return image
+
+
+def _render_job(func, args, size):
+    with np.errstate(all='ignore'):
+        return render_thumbnail(func(*args), size)
+
+
+def thumbnail_icon(image):
+    """QIcon for an atlas image; Qt is imported here so the module stays GUI-free."""
+    from PyQt6.QtGui import QIcon, QImage, QPixmap
+    height, width, _ = image.shape
+    qimage = QImage(image.tobytes(), width, height, 3 * width, QImage.Format.Format_RGB888)
+    return QIcon(QPixmap.fromImage(qimage.copy()))
+
+
+class ThumbnailAtlas:
+    def __init__(self, directory=ATLAS_DIR, size=THUMB_SIZE):
+        self.directory = directory
+        self.size = size
+        self.slot_bytes = size * size * 3
+        self.index = self._read_index()
+
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE)) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return index if index.get('size') == self.size else {}
+
+    def __contains__(self, key):
+        return key in self.index.get('slots', {})
+
+    def get(self, key):
+        slot = self.index.get('slots', {}).get(key)
+        if slot is None:
+            return None
+        try:
+            with open(os.path.join(self.directory, SLOTS_FILE), 'rb') as f:
+                f.seek(slot * self.slot_bytes)
+                data = f.read(self.slot_bytes)
+        except OSError:
+            return None
+        if len(data) != self.slot_bytes:
+            return None
+        return np.frombuffer(data, dtype=np.uint8).reshape(self.size, self.size, 3)
+
+    def put(self, key, image):
+        os.makedirs(self.directory, exist_ok=True)
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        with open(os.path.join(self.directory, SLOTS_FILE), 'ab') as f:
+            f.write(image.tobytes())
+            slot = f.tell() // self.slot_bytes - 1
+        # Merge with the index on disk in case another window added slots
+        index = self._read_index() or {'size': self.size, 'slots': {}}
+        index['slots'].update(self.index.get('slots', {}))
+        index['slots'][key] = slot
+        tmp = os.path.join(self.directory, INDEX_FILE + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp, os.path.join(self.directory, INDEX_FILE))
+        self.index = index
+
+
+class ThumbnailPool:
+    """Fills an atlas in the background.
+
+    `request` returns the cached image right away when there is one and
+    otherwise schedules a render of func(*args); finished renders are
+    stored in the atlas and handed out by `poll`.
+    """
+
+    def __init__(self, atlas=None, workers=None):
+        self.atlas = atlas or ThumbnailAtlas()
+        workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        # spawn keeps the children free of the parent's GUI state
+        self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+        self.pending = {}
+
+    def request(self, key, func, *args):
+        image = self.atlas.get(key)
+        if image is None and key not in self.pending:
+            self.pending[key] = self.executor.submit(_render_job, func, args, self.atlas.size)
+        return image
+
+    def poll(self):
+        done = []
+        for key, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[key]
+            try:
+                image = future.result()
+            except Exception as e:
+                print(f"Error rendering thumbnail: {e}")
+                continue
+            self.atlas.put(key, image)
+            done.append((key, image))
+        return done
+
+    def busy(self):
+        return bool(self.pending)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
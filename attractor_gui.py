@@ -0,0 +1,125 @@
+import inspect
+import sys
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QListWidget, QMessageBox
+from PyQt6.QtCore import Qt, QSize, QTimer
+
+from attractor import ATTRACTORS
+from attractor_core.thumbnails import THUMB_SIZE, ThumbnailPool, thumbnail_icon, thumbnail_key
+
+class AttractorPlotCanvas(FigureCanvas):
+    def __init__(self, parent=None, width=5, height=4, dpi=100):
+        fig = Figure(figsize=(width, height), dpi=dpi)
+        self.ax = fig.add_subplot(111, projection='3d')
+        super().__init__(fig)
+        self.setParent(parent)
+
+    def plot_attractor(self, func):
+        try:
+            print(f"Plotting function: {func.__name__}")
+            self.ax.clear()
+            t = np.linspace(0, 50, 10000)
+            x, y, z = func(t)
+            self.ax.plot(x, y, z)
+            self.ax.set_xlabel('X')
+            self.ax.set_ylabel('Y')
+            self.ax.set_zlabel('Z')
+            self.draw()
+        except Exception as e:
+            QMessageBox.critical(self, "Plotting Error", f"An error occurred while plotting: {e}")
+            print(f"Error in plot_attractor: {e}")
+
+class MainWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle('3D Attractor Visualizer')
+        self.setGeometry(100, 100, 1000, 600)
+
+        self.canvas = AttractorPlotCanvas(self, width=8, height=6)
+        self.load_button = QPushButton('Load Attractors')
+        self.load_button.clicked.connect(self.load_attractors)
+
+        self.attractor_list = QListWidget()
+        self.attractor_list.setIconSize(QSize(THUMB_SIZE, THUMB_SIZE))
+        self.attractor_list.clicked.connect(self.plot_selected_attractor)
+
+        layout = QHBoxLayout()
+        left_layout = QVBoxLayout()
+        left_layout.addWidget(self.canvas)
+        left_layout.addWidget(self.load_button)
+        layout.addLayout(left_layout)
+        layout.addWidget(self.attractor_list)
+
+        container = QWidget()
+        container.setLayout(layout)
+        self.setCentralWidget(container)
+
+        self.attractors = dict(ATTRACTORS)
+        self.thumbnails = ThumbnailPool()
+        self.thumbnail_items = {}
+        self.thumbnail_timer = QTimer()
+        self.thumbnail_timer.timeout.connect(self.update_thumbnails)
+        self.load_attractors()
+
+    def load_attractors(self):
+        try:
+            self.attractor_list.clear()
+            self.thumbnail_items.clear()
+            t = np.linspace(0, 50, 10000)
+            for name, func in self.attractors.items():
+                self.attractor_list.addItem(name)
+                item = self.attractor_list.item(self.attractor_list.count() - 1)
+                # Default parameters are part of the key, so editing one in attractor.py renders a new preview
+                defaults = {p.name: p.default for p in list(inspect.signature(func).parameters.values())[1:]}
+                key = thumbnail_key('attractor', name, defaults, 0, 50, t.size)
+                image = self.thumbnails.request(key, func, t)
+                if image is not None:
+                    item.setIcon(thumbnail_icon(image))
+                else:
+                    self.thumbnail_items[key] = item
+                print(f"Loaded function: {name}")
+            if self.thumbnail_items:
+                self.thumbnail_timer.start(100)
+        except Exception as e:
+            QMessageBox.critical(self, "Loading Error", f"An error occurred while loading attractors: {e}")
+            print(f"Error in load_attractors: {e}")
+
+    def plot_selected_attractor(self):
+        try:
+            selected_item = self.attractor_list.currentItem()
+            if selected_item:
+                func_name = selected_item.text()
+                func = self.attractors[func_name]
+                self.canvas.plot_attractor(func)
+                print(f"Selected function: {func_name}")
+        except Exception as e:
+            QMessageBox.critical(self, "Selection Error", f"An error occurred while plotting the selected attractor: {e}")
+            print(f"Error in plot_selected_attractor: {e}")
+
+    def update_thumbnails(self):
+        for key, image in self.thumbnails.poll():
+            item = self.thumbnail_items.pop(key, None)
+            if item is not None:
+                item.setIcon(thumbnail_icon(image))
+        if not self.thumbnails.busy():
+            self.thumbnail_timer.stop()
+
+    def closeEvent(self, event):
+        self.thumbnail_timer.stop()
+        self.thumbnails.shutdown()
+        super().closeEvent(event)
+
+def main():
+    try:
+        app = QApplication(sys.argv)
+        main_window = MainWindow()
+        main_window.show()
+        sys.exit(app.exec())
+    except Exception as e:
+        print(f"Error in main: {e}")
+
+if __name__ == '__main__':
+    main()
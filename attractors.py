@@ -1,11 +1,19 @@
 import sys
 import numpy as np
-from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QComboBox, QTextEdit, QPushButton
+from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QComboBox, QTextEdit, QPushButton, QCheckBox
 from PyQt6.QtCore import QTimer
 import pyqtgraph as pg
 from pyqtgraph.Qt import QtCore, QtGui
 import pyqtgraph.opengl as gl
 
+from attractor_core import systems
+from attractor_core.systems import euler_step
+
+CLOUD_PARTICLES = 100000
+CLOUD_RADIUS = 0.5
+CLOUD_SUBSTEPS = 2
+CLOUD_ESCAPE = 1e3
+
 class AttractorApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -24,16 +32,16 @@ class AttractorApp(QMainWindow):
 
         self.attractor_combo = QComboBox()
         self.attractors = {
-            "Lorenz": self.lorenz,
-            "Rössler": self.rossler,
-            "Aizawa": self.aizawa,
-            "Chen": self.chen,
-            "Halvorsen": self.halvorsen,
-            "Thomas": self.thomas,
-            "Sprott": self.sprott,
-            "Dadras": self.dadras,
-            "Four-Wing": self.four_wing,
-            "Burke-Shaw": self.burke_shaw
+            "Lorenz": systems.lorenz,
+            "Rössler": systems.rossler,
+            "Aizawa": systems.aizawa,
+            "Chen": systems.chen,
+            "Halvorsen": systems.halvorsen,
+            "Thomas": systems.thomas,
+            "Sprott": systems.sprott,
+            "Dadras": systems.dadras,
+            "Four-Wing": systems.four_wing,
+            "Burke-Shaw": systems.burke_shaw
         }
         self.attractor_combo.addItems(self.attractors.keys())
         self.control_layout.addWidget(self.attractor_combo)
@@ -42,6 +50,9 @@ class AttractorApp(QMainWindow):
         self.description.setReadOnly(True)
         self.control_layout.addWidget(self.description)
 
+        self.cloud_checkbox = QCheckBox("Particle cloud")
+        self.control_layout.addWidget(self.cloud_checkbox)
+
         self.start_button = QPushButton("Start")
         self.start_button.clicked.connect(self.start_animation)
         self.control_layout.addWidget(self.start_button)
@@ -60,19 +71,65 @@ class AttractorApp(QMainWindow):
         self.timer.timeout.connect(self.update_plot)
         self.current_attractor = None
         self.x, self.y, self.z = 0.1, 0.1, 0.1
+        self.cloud = None
 
     def start_animation(self):
         self.current_attractor = self.attractors[self.attractor_combo.currentText()]
         self.x, self.y, self.z = 0.1, 0.1, 0.1
-        self.timer.start(50)
+        if self.cloud_checkbox.isChecked():
+            self.seed_cloud()
+            self.timer.start(16)
+        else:
+            self.cloud = None
+            self.timer.start(50)
 
     def stop_animation(self):
         self.timer.stop()
 
+    def seed_cloud(self):
+        # Uniform ball of particles around the initial condition
+        rng = np.random.default_rng()
+        directions = rng.normal(size=(CLOUD_PARTICLES, 3))
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+        radii = CLOUD_RADIUS * np.cbrt(rng.random(CLOUD_PARTICLES))
+        seeds = np.array([self.x, self.y, self.z]) + directions * radii[:, None]
+        self.cloud = [seeds[:, 0].copy(), seeds[:, 1].copy(), seeds[:, 2].copy()]
+        self.cloud_seeds = seeds
+        self.cloud_pos = np.empty((CLOUD_PARTICLES, 3), dtype=np.float32)
+        self.cloud_colors = np.ones((CLOUD_PARTICLES, 4), dtype=np.float32)
+
+    def update_cloud(self):
+        x, y, z = self.cloud
+        with np.errstate(over='ignore', invalid='ignore'):
+            for _ in range(CLOUD_SUBSTEPS):
+                nx, ny, nz = euler_step(self.current_attractor, x, y, z, ())
+                speed = np.sqrt((nx - x)**2 + (ny - y)**2 + (nz - z)**2)
+                x, y, z = nx, ny, nz
+
+        # Particles that leave the attractor are put back at their seed
+        escaped = ~np.isfinite(speed) | (np.abs(x) > CLOUD_ESCAPE) | (np.abs(y) > CLOUD_ESCAPE) | (np.abs(z) > CLOUD_ESCAPE)
+        if escaped.any():
+            x[escaped], y[escaped], z[escaped] = self.cloud_seeds[escaped].T
+            speed[escaped] = 0
+        self.cloud = [x, y, z]
+
+        self.cloud_pos[:, 0] = x
+        self.cloud_pos[:, 1] = y
+        self.cloud_pos[:, 2] = z
+        scale = np.percentile(speed[::97], 99) or 1.0
+        t = np.clip(speed / scale, 0, 1)
+        self.cloud_colors[:, 0] = t
+        self.cloud_colors[:, 1] = 1 - np.abs(2 * t - 1)
+        self.cloud_colors[:, 2] = 1 - t
+        self.points.setData(pos=self.cloud_pos, color=self.cloud_colors, size=1)
+
     def update_plot(self):
-        points = np.zeros((1000, 3))
+        if self.cloud is not None:
+            self.update_cloud()
+            return
+        points = np.zeros((1000, 3), dtype=np.float32)
         for i in range(1000):
-            self.x, self.y, self.z = self.current_attractor(self.x, self.y, self.z)
+            self.x, self.y, self.z = euler_step(self.current_attractor, self.x, self.y, self.z, ())
             points[i] = [self.x, self.y, self.z]
         self.points.setData(pos=points, color=(1, 1, 1, 1), size=2)
 
@@ -91,67 +148,6 @@ class AttractorApp(QMainWindow):
         }
         self.description.setText(descriptions[attractor_name])
 
-    # Attractor equations
-    def lorenz(self, x, y, z, a=10, b=28, c=8/3):
-        dx = a * (y - x)
-        dy = x * (b - z) - y
-        dz = x * y - c * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def rossler(self, x, y, z, a=0.2, b=0.2, c=5.7):
-        dx = -y - z
-        dy = x + a * y
-        dz = b + z * (x - c)
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def aizawa(self, x, y, z, a=0.95, b=0.7, c=0.6, d=3.5, e=0.25, f=0.1):
-        dx = (z - b) * x - d * y
-        dy = d * x + (z - b) * y
-        dz = c + a * z - z**3 / 3 - (x**2 + y**2) * (1 + e * z) + f * z * x**3
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def chen(self, x, y, z, a=35, b=3, c=28):
-        dx = a * (y - x)
-        dy = (c - a) * x - x * z + c * y
-        dz = x * y - b * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def halvorsen(self, x, y, z, a=1.4):
-        dx = -a * x - 4 * y - 4 * z - y**2
-        dy = -a * y - 4 * z - 4 * x - z**2
-        dz = -a * z - 4 * x - 4 * y - x**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def thomas(self, x, y, z, b=0.208186):
-        dx = -b * x + np.sin(y)
-        dy = -b * y + np.sin(z)
-        dz = -b * z + np.sin(x)
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def sprott(self, x, y, z, a=2.07):
-        dx = y + a * x * y + x * z
-        dy = 1 - a * x**2 + y * z
-        dz = x - x**2 - y**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def dadras(self, x, y, z, a=3, b=2.7, c=1.7, d=2, e=9):
-        dx = y - a * x + b * y * z
-        dy = c * y - x * z + z
-        dz = d * x * y - e * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def four_wing(self, x, y, z, a=0.2, b=0.01, c=-0.4):
-        dx = a * x + y * z
-        dy = b * x + c * y - x * z
-        dz = -z - x * y
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def burke_shaw(self, x, y, z, s=10, v=4.272):
-        dx = -s * (x + y)
-        dy = -y - s * x * z
-        dz = s * x * y + v
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = AttractorApp()
@@ -1,10 +1,62 @@
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QComboBox, QTextEdit, QPushButton, QSlider
-from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtCore import QObject, QTimer, Qt, QSize, pyqtSignal
 import pyqtgraph.opengl as gl
 import pyqtgraph as pg
 
+from attractor_core import systems
+from attractor_core.checkpoint import KEPT_FILE, STATE_FILE, Checkpointer, load_checkpoint, new_session_id
+from attractor_core.systems import DEFAULT_DT, euler_step, integrate
+from attractor_core.thumbnails import THUMB_SIZE, ThumbnailPool, thumbnail_icon, thumbnail_key
+
+CHECKPOINT_DIR = os.path.join(os.path.expanduser("~"), ".attractors2", "checkpoint")
+
+# The integrator state stays float64; the accumulated points only feed the
+# renderer, which draws float32 anyway.
+POINT_DTYPE = np.float32
+THUMB_STEPS = 5000
+
+# Slider moves are applied at most once per SLIDER_DEBOUNCE_MS: the first
+# move of a drag right away, the latest one when the interval ends. Each
+# applied change restarts the trajectory from the current state with the
+# new parameters, recomputed in a worker thread: first at PREVIEW_STRIDE
+# times the step size, then at full resolution. The previous trajectory
+# fades out over GHOST_FRAMES frames.
+SLIDER_DEBOUNCE_MS = 40
+RECOMPUTE_STEPS = (1000, 20000)
+RECOMPUTE_CHUNK = 2000
+PREVIEW_STRIDE = 8
+GHOST_FRAMES = 20
+FRAME_MS = 50
+
+def _hue_table():
+    # RGB of every integer hue 0..359 at full saturation and value
+    h = np.arange(360) / 60.0
+    sector = np.floor(h).astype(int) % 6
+    f = (h - np.floor(h)).astype(np.float32)
+    one, zero = np.ones(360, dtype=np.float32), np.zeros(360, dtype=np.float32)
+    return np.select(
+        [sector[:, None] == k for k in range(6)],
+        [np.column_stack(c) for c in [(one, f, zero), (1 - f, one, zero), (zero, one, f),
+                                      (zero, 1 - f, one), (f, zero, one), (one, zero, 1 - f)]],
+    ).astype(np.float32)
+
+HUES = _hue_table()
+
+def rainbow_colors(n, alpha=1.0):
+    # Same colors as [pg.glColor((i, n)) for i in range(n)], without a Python loop
+    colors = np.empty((n, 4), dtype=np.float32)
+    colors[:, :3] = HUES[np.arange(n) * 360 // max(n, 1)]
+    colors[:, 3] = alpha
+    return colors
+
+class RecomputeSignals(QObject):
+    # generation, points, final
+    ready = pyqtSignal(int, object, bool)
+
 class AttractorApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -23,28 +75,29 @@ class AttractorApp(QMainWindow):
 
         self.attractor_combo = QComboBox()
         self.attractors = {
-            "Lorenz": (self.lorenz, ["sigma", "rho", "beta"]),
-            "Rössler": (self.rossler, ["a", "b", "c"]),
-            "Aizawa": (self.aizawa, ["a", "b", "c", "d", "e", "f"]),
-            "Chen": (self.chen, ["a", "b", "c"]),
-            "Halvorsen": (self.halvorsen, ["a"]),
-            "Thomas": (self.thomas, ["b"]),
-            "Sprott": (self.sprott, ["a"]),
-            "Dadras": (self.dadras, ["a", "b", "c", "d", "e"]),
-            "Four-Wing": (self.four_wing, ["a", "b", "c"]),
-            "Burke-Shaw": (self.burke_shaw, ["s", "v"]),
-            "Lorenz83": (self.lorenz83, ["a", "b", "f", "g"]),
-            "Moore-Spiegel": (self.moore_spiegel, ["a", "b", "c"]),
-            "Rucklidge": (self.rucklidge, ["a", "k"]),
-            "Dequan Li": (self.dequan_li, ["a", "c", "d", "e", "k", "f"]),
-            "Yu-Wang": (self.yu_wang, ["a", "b", "c", "d"]),
-            "Nose-Hoover": (self.nose_hoover, ["a"]),
-            "Rabinovich-Fabrikant": (self.rabinovich_fabrikant, ["alpha", "gamma"]),
-            "Three-Scroll Unified Chaotic System": (self.three_scroll, ["a", "b", "c", "d", "e"]),
-            "Tamari": (self.tamari, ["a", "b", "c"]),
-            "Scroll": (self.scroll, ["a", "b", "c", "d"])
+            "Lorenz": (systems.lorenz, ["sigma", "rho", "beta"]),
+            "Rössler": (systems.rossler, ["a", "b", "c"]),
+            "Aizawa": (systems.aizawa, ["a", "b", "c", "d", "e", "f"]),
+            "Chen": (systems.chen, ["a", "b", "c"]),
+            "Halvorsen": (systems.halvorsen, ["a"]),
+            "Thomas": (systems.thomas, ["b"]),
+            "Sprott": (systems.sprott, ["a"]),
+            "Dadras": (systems.dadras, ["a", "b", "c", "d", "e"]),
+            "Four-Wing": (systems.four_wing, ["a", "b", "c"]),
+            "Burke-Shaw": (systems.burke_shaw, ["s", "v"]),
+            "Lorenz83": (systems.lorenz83, ["a", "b", "f", "g"]),
+            "Moore-Spiegel": (systems.moore_spiegel, ["a", "b", "c"]),
+            "Rucklidge": (systems.rucklidge, ["a", "k"]),
+            "Dequan Li": (systems.dequan_li, ["a", "c", "d", "e", "k", "f"]),
+            "Yu-Wang": (systems.yu_wang, ["a", "b", "c", "d"]),
+            "Nose-Hoover": (systems.nose_hoover, ["a"]),
+            "Rabinovich-Fabrikant": (systems.rabinovich_fabrikant, ["alpha", "gamma"]),
+            "Three-Scroll Unified Chaotic System": (systems.three_scroll, ["a", "b", "c", "d", "e"]),
+            "Tamari": (systems.tamari, ["a", "b", "c"]),
+            "Scroll": (systems.scroll, ["a", "b", "c", "d"])
         }
         self.attractor_combo.addItems(self.attractors.keys())
+        self.attractor_combo.setIconSize(QSize(THUMB_SIZE, THUMB_SIZE))
         self.control_layout.addWidget(self.attractor_combo)
 
         self.description = QTextEdit()
@@ -63,6 +116,15 @@ class AttractorApp(QMainWindow):
         self.stop_button.clicked.connect(self.stop_animation)
         self.control_layout.addWidget(self.stop_button)
 
+        self.resume_button = QPushButton("Resume")
+        self.resume_button.clicked.connect(lambda: self.resume_animation())
+        self.control_layout.addWidget(self.resume_button)
+
+        # The session as it was before the first slider change since Start
+        self.resume_kept_button = QPushButton("Resume Before Slider Change")
+        self.resume_kept_button.clicked.connect(lambda: self.resume_animation(KEPT_FILE))
+        self.control_layout.addWidget(self.resume_kept_button)
+
         self.quit_button = QPushButton("Quit")
         self.quit_button.clicked.connect(self.close)
         self.control_layout.addWidget(self.quit_button)
@@ -72,11 +134,64 @@ class AttractorApp(QMainWindow):
 
         self.points = gl.GLLinePlotItem(pos=np.zeros((1, 3)), color=pg.glColor((255, 0, 0)), width=1.5, antialias=True)
         self.plot_widget.addItem(self.points)
+        self.ghost = gl.GLLinePlotItem(pos=np.zeros((1, 3)), width=1.5, antialias=True)
+        self.ghost.setVisible(False)
+        self.plot_widget.addItem(self.ghost)
+        self.shown = np.zeros((1, 3), dtype=POINT_DTYPE)
+        self.colors = rainbow_colors(1)
+        self.ghost_points = None
+        self.ghost_colors = None
+        self.ghost_frame = 0
 
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_plot)
+        self.fade_timer = QTimer()
+        self.fade_timer.timeout.connect(self.fade_ghost)
+        self.slider_timer = QTimer()
+        self.slider_timer.setSingleShot(True)
+        self.slider_timer.setInterval(SLIDER_DEBOUNCE_MS)
+        self.slider_timer.timeout.connect(self.flush_sliders)
+        self.sliders_dirty = False
+
         self.current_attractor = None
+        self.params = ()
         self.x, self.y, self.z = 0.1, 0.1, 0.1
+        self.session = None
+        self.steps = 0
+        self.checkpointer = Checkpointer(CHECKPOINT_DIR)
+
+        self.generation = 0
+        self.recomputing = False
+        self.recompute_pool = ThreadPoolExecutor(max_workers=1)
+        self.recompute_signals = RecomputeSignals()
+        self.recompute_signals.ready.connect(self.show_recomputed)
+
+        self.thumbnails = ThumbnailPool()
+        self.thumbnail_indices = {}
+        self.thumbnail_timer = QTimer()
+        self.thumbnail_timer.timeout.connect(self.update_thumbnails)
+        self.request_thumbnails()
+
+    def request_thumbnails(self):
+        # Previews use the parameters Start begins with (every slider at 50)
+        for index, (name, (func, params)) in enumerate(self.attractors.items()):
+            values = (1.0,) * len(params)
+            key = thumbnail_key("attractors2", name, values, (self.x, self.y, self.z), THUMB_STEPS)
+            image = self.thumbnails.request(key, integrate, func, (self.x, self.y, self.z), values, THUMB_STEPS)
+            if image is not None:
+                self.attractor_combo.setItemIcon(index, thumbnail_icon(image))
+            else:
+                self.thumbnail_indices[key] = index
+        if self.thumbnail_indices:
+            self.thumbnail_timer.start(100)
+
+    def update_thumbnails(self):
+        for key, image in self.thumbnails.poll():
+            index = self.thumbnail_indices.pop(key, None)
+            if index is not None:
+                self.attractor_combo.setItemIcon(index, thumbnail_icon(image))
+        if not self.thumbnails.busy():
+            self.thumbnail_timer.stop()
 
     def create_sliders(self, params):
         for widget in self.sliders.values():
@@ -88,210 +203,207 @@ class AttractorApp(QMainWindow):
             slider = QSlider(Qt.Orientation.Horizontal)
             slider.setRange(0, 100)
             slider.setValue(50)
+            slider.valueChanged.connect(self.slider_moved)
             self.sliders[param] = slider
             self.slider_layout.addWidget(slider)
+        self.params = self.slider_params()
+
+    def slider_params(self):
+        return tuple(slider.value() / 50 for slider in self.sliders.values())
+
+    def slider_moved(self):
+        if self.slider_timer.isActive():
+            self.sliders_dirty = True
+        else:
+            self.apply_sliders()
+            self.slider_timer.start()
+
+    def flush_sliders(self):
+        if self.sliders_dirty:
+            self.sliders_dirty = False
+            self.apply_sliders()
+            self.slider_timer.start()
+
+    def apply_sliders(self):
+        params = self.slider_params()
+        if params == self.params or self.current_attractor is None:
+            return
+        if self.session is not None and not self.checkpointer.kept:
+            # The recompute replaces the trajectory; set the current session
+            # aside on disk first, so a stray nudge cannot lose a long render.
+            # It stays until Start begins a new trajectory.
+            self.save_checkpoint()
+            self.checkpointer.keep()
+        self.params = params
+        self.generation += 1
+        self.recomputing = True
+        self.start_ghost()
+        # Redraw from the current state only; the preview follows shortly
+        self.draw(np.array([[self.x, self.y, self.z]], dtype=POINT_DTYPE))
+        steps = int(np.clip(len(self.points_list), *RECOMPUTE_STEPS))
+        self.recompute_pool.submit(self.recompute, self.generation, self.current_attractor,
+                                   (self.x, self.y, self.z), params, steps)
+
+    def recompute(self, generation, func, state, params, steps):
+        # Runs in the worker thread; gives up as soon as a newer change arrives
+        try:
+            coarse = integrate(func, state, params, steps // PREVIEW_STRIDE + 1, DEFAULT_DT * PREVIEW_STRIDE)
+            if generation != self.generation:
+                return
+            self.recompute_signals.ready.emit(generation, coarse, False)
+            chunks = [np.array([state])]
+            while steps > 0 and generation == self.generation:
+                n = min(steps, RECOMPUTE_CHUNK)
+                part = integrate(func, chunks[-1][-1], params, n + 1)
+                chunks.append(part[1:])
+                steps -= n
+            if generation == self.generation:
+                self.recompute_signals.ready.emit(generation, np.concatenate(chunks), True)
+        except Exception as e:
+            print(f"Error recomputing trajectory: {e}")
+
+    def show_recomputed(self, generation, points, final):
+        if generation != self.generation:
+            return
+        with np.errstate(over='ignore'):
+            shown = points.astype(POINT_DTYPE)
+        finite = np.isfinite(shown).all(axis=1)
+        if not finite.all():
+            # Keep what came before the trajectory blew up
+            keep = max(np.argmin(finite), 1)
+            points, shown = points[:keep], shown[:keep]
+        if not final:
+            if len(shown) > 1:
+                self.draw(shown)
+            return
+        # The buffer now holds a different trajectory, so checkpoints start over
+        self.points_list = shown
+        self.x, self.y, self.z = (float(v) for v in points[-1])
+        self.session = new_session_id()
+        self.steps = len(points) - 1
+        self.recomputing = False
+        self.draw(self.points_list)
+
+    def draw(self, points):
+        # The gradient is built for up to 25% more points than shown and
+        # reused while the buffer grows into it, so a frame that adds 10
+        # rows does not recolor the whole trajectory
+        n = len(points)
+        if self.colors is None or not n <= len(self.colors) <= n + n // 4 + 16:
+            self.colors = rainbow_colors(n + n // 4 + 16)
+        self.shown = points
+        self.points.setData(pos=points, color=self.colors[:n])
+
+    def start_ghost(self):
+        # A change landing before the last preview keeps the older ghost
+        if len(self.shown) > 1:
+            self.ghost_points = self.shown
+            # Colors are built once per ghost; fading only rewrites the alpha column
+            self.ghost_colors = self.colors[:len(self.shown)].copy()
+            self.ghost.setData(pos=self.ghost_points)
+        if self.ghost_points is None:
+            return
+        self.ghost_frame = 0
+        self.ghost.setVisible(True)
+        self.fade_ghost()
+        self.fade_timer.start(FRAME_MS)
+
+    def fade_ghost(self):
+        alpha = 1.0 - self.ghost_frame / GHOST_FRAMES
+        if alpha <= 0:
+            self.fade_timer.stop()
+            self.ghost.setVisible(False)
+            self.ghost_points = None
+            self.ghost_colors = None
+            return
+        self.ghost_colors[:, 3] = 0.6 * alpha
+        self.ghost.setData(color=self.ghost_colors)
+        self.ghost_frame += 1
 
     def start_animation(self):
         attractor_name = self.attractor_combo.currentText()
         self.current_attractor, params = self.attractors[attractor_name]
         self.create_sliders(params)
+        self.generation += 1
+        self.recomputing = False
         self.x, self.y, self.z = 0.1, 0.1, 0.1
-        self.points_list = np.array([[self.x, self.y, self.z]])
-        self.timer.start(50)
+        self.points_list = np.array([[self.x, self.y, self.z]], dtype=POINT_DTYPE)
+        self.attractor_name = attractor_name
+        self.session = new_session_id()
+        self.steps = 0
+        self.checkpointer.release()
+        self.timer.start(FRAME_MS)
 
     def stop_animation(self):
         self.timer.stop()
-
-    def update_plot(self):
-        attractor_name = self.attractor_combo.currentText()
-        for _ in range(10):
-            params = [slider.value() / 50 for slider in self.sliders.values()]
-            self.x, self.y, self.z = self.current_attractor(self.x, self.y, self.z, *params)
-            self.points_list = np.vstack((self.points_list, [self.x, self.y, self.z]))
-
-        colors = np.array([pg.glColor((i, self.points_list.shape[0])) for i in range(self.points_list.shape[0])])
-        self.points.setData(pos=self.points_list, color=colors)
-
-    def update_description(self, attractor_name):
-        descriptions = {
-            "Lorenz": "The Lorenz attractor is a classic example of a chaotic system. It was first studied by Edward Lorenz in 1963 and is known for its butterfly-like shape.\nMore info: https://arxiv.org/abs/nlin/0501023",
-            "Rössler": "The Rössler attractor was discovered by Otto Rössler in 1976. It's known for its simple equations but complex behavior.\nMore info: https://arxiv.org/abs/nlin/0502028",
-            "Aizawa": "The Aizawa attractor is a lesser-known but visually striking attractor with a unique spiral structure.\nMore info: https://arxiv.org/abs/1101.2124",
-            "Chen": "The Chen system is a three-dimensional flow that exhibits chaotic behavior. It was discovered by Guanrong Chen and Tetsushi Ueta in 1999.\nMore info: https://arxiv.org/abs/nlin/0307009",
-            "Halvorsen": "The Halvorsen attractor is known for its symmetrical, pretzel-like shape and was discovered by Norwegian mathematician Ingemar Halvorsen.\nMore info: https://arxiv.org/abs/1007.1057",
-            "Thomas": "The Thomas' cyclically symmetric attractor was discovered by René Thomas. It's known for its highly symmetric structure.\nMore info: https://arxiv.org/abs/nlin/0107044",
-            "Sprott": "The Sprott attractor is one of many chaotic systems discovered by Julien C. Sprott through a systematic search of simple chaotic flows.\nMore info: https://arxiv.org/abs/nlin/0507037",
-            "Dadras": "The Dadras system is a relatively new chaotic system with a unique butterfly-like structure.\nMore info: https://arxiv.org/abs/1008.4044",
-            "Four-Wing": "The Four-Wing attractor is a chaotic system that exhibits a unique four-wing butterfly shape.\nMore info: https://arxiv.org/abs/1301.0538",
-            "Burke-Shaw": "The Burke-Shaw attractor is a three-dimensional chaotic attractor discovered by Bill Burke and Robert Shaw in 1981.\nMore info: https://arxiv.org/abs/nlin/0301023",
-            "Lorenz83": "The Lorenz-83 model is a simplified model of the general atmospheric circulation.\nMore info: https://arxiv.org/abs/nlin/0110046",
-            "Moore-Spiegel": "The Moore-Spiegel oscillator is a model for the dynamo of a star.\nMore info: https://arxiv.org/abs/1409.3554",
-            "Rucklidge": "The Rucklidge attractor models thermal convection in fluids.\nMore info: https://arxiv.org/abs/nlin/0508021",
-            "Dequan Li": "The Dequan Li system is a new chaotic attractor with a complex structure.\nMore info: https://arxiv.org/abs/1205.3181",
-            "Yu-Wang": "The Yu-Wang system is a recently discovered chaotic system with a unique structure.\nMore info: https://arxiv.org/abs/1406.5353",
-            "Nose-Hoover": "The Nose-Hoover oscillator is used in molecular dynamics simulations.\nMore info: https://arxiv.org/abs/1609.00767",
-            "Rabinovich-Fabrikant": "The Rabinovich-Fabrikant equations model the stochasticity in a plasma.\nMore info: https://arxiv.org/abs/1604.02081",
-            "Three-Scroll Unified Chaotic System": "This system unifies several known chaotic systems and produces three-scroll attractors.\nMore info: https://arxiv.org/abs/1404.2548",
-            "Tamari": "The Tamari attractor is a lesser-known chaotic system with interesting properties.\nMore info: https://arxiv.org/abs/1706.05364",
-            "Scroll": "The Scroll system produces a scroll-shaped attractor.\nMore info: https://arxiv.org/abs/1510.00344"
+        self.save_checkpoint()
+
+    def resume_animation(self, state_file=STATE_FILE):
+        if self.timer.isActive():
+            return
+        self.checkpointer.flush()
+        checkpoint = load_checkpoint(CHECKPOINT_DIR, state_file)
+        if checkpoint is None or checkpoint[0].get("attractor") not in self.attractors:
+            self.description.setText("No checkpoint to resume from.")
+            return
+        state, points = checkpoint
+        self.attractor_combo.setCurrentText(state["attractor"])
+        self.attractor_name = state["attractor"]
+        self.current_attractor, params = self.attractors[self.attractor_name]
+        self.create_sliders(params)
+        for param, value in state["sliders"].items():
+            if param in self.sliders:
+                self.sliders[param].blockSignals(True)
+                self.sliders[param].setValue(value)
+                self.sliders[param].blockSignals(False)
+        self.params = self.slider_params()
+        self.generation += 1
+        self.recomputing = False
+        self.x, self.y, self.z = state["x"], state["y"], state["z"]
+        self.points_list = points
+        self.session = state["session"]
+        self.steps = state["steps"]
+        self.timer.start(FRAME_MS)
+
+    def checkpoint_state(self):
+        return {
+            "session": self.session,
+            "attractor": self.attractor_name,
+            # The applied values; a drag still being debounced is not saved yet
+            "sliders": {param: round(value * 50) for param, value in zip(self.sliders, self.params)},
+            "x": float(self.x), "y": float(self.y), "z": float(self.z),
+            "steps": self.steps,
         }
-        self.description.setText(descriptions[attractor_name])
 
-    # Attractor equations
-    def lorenz(self, x, y, z, sigma=10, rho=28, beta=8/3):
-        dx = sigma * (y - x)
-        dy = x * (rho - z) - y
-        dz = x * y - beta * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def rossler(self, x, y, z, a=0.2, b=0.2, c=5.7):
-        dx = -y - z
-        dy = x + a * y
-        dz = b + z * (x - c)
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def aizawa(self, x, y, z, a=0.95, b=0.7, c=0.6, d=3.5, e=0.25, f=0.1):
-        dx = (z - b) * x - d * y
-        dy = d * x + (z - b) * y
-        dz = c + a * z - z**3 / 3 - (x**2 + y**2) * (1 + e * z) + f * z * x**3
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def chen(self, x, y, z, a=35, b=3, c=28):
-        dx = a * (y - x)
-        dy = (c - a) * x - x * z + c * y
-        dz = x * y - b * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def halvorsen(self, x, y, z, a=1.4):
-        dx = -a * x - 4 * y - 4 * z - y**2
-        dy = -a * y - 4 * z - 4 * x - z**2
-        dz = -a * z - 4 * x - 4 * y - x**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def thomas(self, x, y, z, b=0.208186):
-        dx = -b * x + np.sin(y)
-        dy = -b * y + np.sin(z)
-        dz = -b * z + np.sin(x)
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def sprott(self, x, y, z, a=2.07):
-        dx = y + a * x * y + x * z
-        dy = 1 - a * x**2 + y * z
-        dz = x - x**2 - y**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def dadras(self, x, y, z, a=3, b=2.7, c=1.7, d=2, e=9):
-        dx = y - a * x + b * y * z
-        dy = c * y - x * z + z
-        dz = d * x * y - e * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def four_wing(self, x, y, z, a=0.2, b=0.01, c=-0.4):
-        dx = a * x + y * z
-        dy = b * x + c * y - x * z
-        dz = -z - x * y
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def burke_shaw(self, x, y, z, s=10, v=4.272):
-        dx = -s * (x + y)
-        dy = -y - s * x * z
-        dz = s * x * y + v
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def lorenz83(self, x, y, z, a=0.95, b=7.91, f=4.83, g=4.66):
-        dx = -a * x - y**2 - z**2 + a * f
-        dy = -y + x * y - b * x * z + g
-        dz = -z + b * x * y + x * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def moore_spiegel(self, x, y, z, a=100, b=26, c=0.5):
-        dx = y
-        dy = z
-        dz = -z - (a - c * x**2) * y - c * x
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-    
-    def rucklidge(self, x, y, z, a=2, k=6.7):
-        dx = -a * x + k * y - y * z
-        dy = x
-        dz = -z + y**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def dequan_li(self, x, y, z, a=40, c=1.833, d=0.16, e=0.65, k=55, f=20):
-        dx = a * (y - x) + d * x * z
-        dy = k * x + f * y - x * z
-        dz = c * z + x * y - e * x**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def yu_wang(self, x, y, z, a=10, b=40, c=2, d=2.5):
-        dx = a * (y - x)
-        dy = b * x - c * x * z
-        dz = np.exp(x * y) - d * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def nose_hoover(self, x, y, z, a=1.5):
-        dx = y
-        dy = -x + y * z
-        dz = a - y**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def rabinovich_fabrikant(self, x, y, z, alpha=0.14, gamma=0.10):
-        dx = y * (z - 1 + x**2) + gamma * x
-        dy = x * (3 * z + 1 - x**2) + gamma * y
-        dz = -2 * z * (alpha + x * y)
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def three_scroll(self, x, y, z, a=40, b=0.833, c=20, d=0.5, e=0.65):
-        dx = a * (y - x) + d * x * z
-        dy = c * y - x * z
-        dz = b * z + x * y - e * x**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def tamari(self, x, y, z, a=1.5, b=0.8, c=2.5):
-        dx = y - a * x
-        dy = b * x - y**2 - z**2
-        dz = x * y - c * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def scroll(self, x, y, z, a=40, b=0.833, c=20, d=0.5):
-        dx = a * (y - x) + d * x * z
-        dy = c * y - x * z
-        dz = b * z + x * y - y**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
+    def save_checkpoint(self):
+        if self.session is not None:
+            self.checkpointer.submit(self.checkpoint_state(), self.points_list)
 
-
-    def create_sliders(self, params):
-        for widget in self.sliders.values():
-            self.slider_layout.removeWidget(widget)
-            widget.deleteLater()
-        self.sliders.clear()
-
-        for param in params:
-            slider = QSlider(Qt.Orientation.Horizontal)
-            slider.setRange(0, 100)
-            slider.setValue(50)
-            self.sliders[param] = slider
-            self.slider_layout.addWidget(slider)
-
-    def start_animation(self):
-        attractor_name = self.attractor_combo.currentText()
-        self.current_attractor, params = self.attractors[attractor_name]
-        self.create_sliders(params)
-        self.x, self.y, self.z = 0.1, 0.1, 0.1
-        self.points_list = np.array([[self.x, self.y, self.z]])
-        self.timer.start(50)
-
-    def stop_animation(self):
+    def closeEvent(self, event):
         self.timer.stop()
+        self.fade_timer.stop()
+        self.slider_timer.stop()
+        self.generation += 1
+        self.recompute_pool.shutdown(wait=False, cancel_futures=True)
+        self.thumbnail_timer.stop()
+        self.thumbnails.shutdown()
+        self.save_checkpoint()
+        self.checkpointer.close()
+        super().closeEvent(event)
 
     def update_plot(self):
-        attractor_name = self.attractor_combo.currentText()
-        for _ in range(10):
-            params = [slider.value() / 50 for slider in self.sliders.values()]
-            self.x, self.y, self.z = self.current_attractor(self.x, self.y, self.z, *params)
-            self.points_list = np.vstack((self.points_list, [self.x, self.y, self.z]))
-
-        colors = np.array([pg.glColor((i, self.points_list.shape[0])) for i in range(self.points_list.shape[0])])
-        self.points.setData(pos=self.points_list, color=colors)
+        if self.recomputing:
+            # The worker owns the trajectory until the refined result arrives
+            return
+        # Parameters only change between frames, in apply_sliders
+        rows = np.empty((10, 3), dtype=POINT_DTYPE)
+        for i in range(10):
+            self.x, self.y, self.z = euler_step(self.current_attractor, self.x, self.y, self.z, self.params)
+            rows[i] = self.x, self.y, self.z
+        self.points_list = np.concatenate((self.points_list, rows))
+        self.steps += 10
+        self.checkpointer.maybe_submit(self.checkpoint_state, lambda: self.points_list)
+        self.draw(self.points_list)
 
     def update_description(self, attractor_name):
         descriptions = {
@@ -318,128 +430,6 @@ class AttractorApp(QMainWindow):
         }
         self.description.setText(descriptions[attractor_name])
 
-    # Attractor equations
-    def lorenz(self, x, y, z, sigma=10, rho=28, beta=8/3):
-        dx = sigma * (y - x)
-        dy = x * (rho - z) - y
-        dz = x * y - beta * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def rossler(self, x, y, z, a=0.2, b=0.2, c=5.7):
-        dx = -y - z
-        dy = x + a * y
-        dz = b + z * (x - c)
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def aizawa(self, x, y, z, a=0.95, b=0.7, c=0.6, d=3.5, e=0.25, f=0.1):
-        dx = (z - b) * x - d * y
-        dy = d * x + (z - b) * y
-        dz = c + a * z - z**3 / 3 - (x**2 + y**2) * (1 + e * z) + f * z * x**3
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def chen(self, x, y, z, a=35, b=3, c=28):
-        dx = a * (y - x)
-        dy = (c - a) * x - x * z + c * y
-        dz = x * y - b * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def halvorsen(self, x, y, z, a=1.4):
-        dx = -a * x - 4 * y - 4 * z - y**2
-        dy = -a * y - 4 * z - 4 * x - z**2
-        dz = -a * z - 4 * x - 4 * y - x**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def thomas(self, x, y, z, b=0.208186):
-        dx = -b * x + np.sin(y)
-        dy = -b * y + np.sin(z)
-        dz = -b * z + np.sin(x)
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def sprott(self, x, y, z, a=2.07):
-        dx = y + a * x * y + x * z
-        dy = 1 - a * x**2 + y * z
-        dz = x - x**2 - y**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def dadras(self, x, y, z, a=3, b=2.7, c=1.7, d=2, e=9):
-        dx = y - a * x + b * y * z
-        dy = c * y - x * z + z
-        dz = d * x * y - e * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def four_wing(self, x, y, z, a=0.2, b=0.01, c=-0.4):
-        dx = a * x + y * z
-        dy = b * x + c * y - x * z
-        dz = -z - x * y
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def burke_shaw(self, x, y, z, s=10, v=4.272):
-        dx = -s * (x + y)
-        dy = -y - s * x * z
-        dz = s * x * y + v
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def lorenz83(self, x, y, z, a=0.95, b=7.91, f=4.83, g=4.66):
-        dx = -a * x - y**2 - z**2 + a * f
-        dy = -y + x * y - b * x * z + g
-        dz = -z + b * x * y + x * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def moore_spiegel(self, x, y, z, a=100, b=26, c=0.5):
-        dx = y
-        dy = z
-        dz = -z - (a - c * x**2) * y - c * x
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-    
-    def rucklidge(self, x, y, z, a=2, k=6.7):
-        dx = -a * x + k * y - y * z
-        dy = x
-        dz = -z + y**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def dequan_li(self, x, y, z, a=40, c=1.833, d=0.16, e=0.65, k=55, f=20):
-        dx = a * (y - x) + d * x * z
-        dy = k * x + f * y - x * z
-        dz = c * z + x * y - e * x**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def yu_wang(self, x, y, z, a=10, b=40, c=2, d=2.5):
-        dx = a * (y - x)
-        dy = b * x - c * x * z
-        dz = np.exp(x * y) - d * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def nose_hoover(self, x, y, z, a=1.5):
-        dx = y
-        dy = -x + y * z
-        dz = a - y**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def rabinovich_fabrikant(self, x, y, z, alpha=0.14, gamma=0.10):
-        dx = y * (z - 1 + x**2) + gamma * x
-        dy = x * (3 * z + 1 - x**2) + gamma * y
-        dz = -2 * z * (alpha + x * y)
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def three_scroll(self, x, y, z, a=40, b=0.833, c=20, d=0.5, e=0.65):
-        dx = a * (y - x) + d * x * z
-        dy = c * y - x * z
-        dz = b * z + x * y - e * x**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def tamari(self, x, y, z, a=1.5, b=0.8, c=2.5):
-        dx = y - a * x
-        dy = b * x - y**2 - z**2
-        dz = x * y - c * z
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-    def scroll(self, x, y, z, a=40, b=0.833, c=20, d=0.5):
-        dx = a * (y - x) + d * x * z
-        dy = c * y - x * z
-        dz = b * z + x * y - y**2
-        return x + dx * 0.01, y + dy * 0.01, z + dz * 0.01
-
-
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = AttractorApp()